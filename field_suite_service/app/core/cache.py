@@ -369,6 +369,27 @@ class RedisCache(CacheInterface):
         except Exception:
             return {"type": "redis", "connected": False}
 
+    async def health_check(self, timeout: float = 1.5) -> dict:
+        """Ping Redis and read memory/client info in a single round trip"""
+        if not self._connected:
+            return {"healthy": True, "type": "in_memory_fallback"}
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.ping()
+                pipe.info("memory")
+                pipe.info("clients")
+                _, memory, clients = await asyncio.wait_for(pipe.execute(), timeout)
+
+            return {
+                "healthy": True,
+                "type": "redis",
+                "memory_used": memory.get("used_memory_human", "unknown"),
+                "connected_clients": clients.get("connected_clients", 0),
+            }
+        except Exception as e:
+            return {"healthy": False, "type": "redis", "message": str(e)}
+
 
 # =============================================================================
 # Cache Manager
@@ -443,6 +464,11 @@ class CacheManager:
             return await self._cache.get_stats()
         return self._cache.get_stats()
 
+    async def health_check(self) -> dict:
+        if isinstance(self._cache, RedisCache):
+            return await self._cache.health_check()
+        return {"healthy": True, "type": "in_memory"}
+
 
 # Global cache instance
 cache_manager = CacheManager()
@@ -5,6 +5,7 @@ Monitoring and Observability for Sahool Yemen
 Advanced metrics, logging, tracing, and health monitoring.
 """
 import asyncio
+import json
 import time
 import os
 import platform
@@ -318,23 +319,34 @@ class HealthChecker:
     Comprehensive health checker for all components
     """
 
-    def __init__(self):
+    def __init__(self, enable_stale_fallback: bool = False, stale_grace: float = 90.0):
         self._checks: dict[str, Callable] = {}
+        self._timeouts: dict[str, float] = {}
+        # Report a failing check as degraded while it was healthy within stale_grace
+        # seconds; the default spans three check intervals so a rerun can fall back
+        self.enable_stale_fallback = enable_stale_fallback
+        self.stale_grace = stale_grace
+        self._last_good: dict[str, tuple[HealthCheckResult, float]] = {}
         self._last_check: Optional[dict] = None
+        self._last_check_body: bytes = b""
         self._check_interval = 30  # seconds
-        self._last_check_time = 0
+        self._last_check_time = 0.0  # time.monotonic() of the last run
+        self._check_lock = asyncio.Lock()
 
-    def register(self, name: str, check: Callable):
-        """Register a health check"""
+    def register(self, name: str, check: Callable, timeout: float = 2.0):
+        """Register a health check, bounded by timeout seconds if async"""
         self._checks[name] = check
+        self._timeouts[name] = timeout
 
-    async def check_component(self, name: str, check: Callable) -> HealthCheckResult:
+    async def check_component(
+        self, name: str, check: Callable, timeout: Optional[float] = None
+    ) -> HealthCheckResult:
         """Run a single health check"""
         start_time = time.time()
 
         try:
             if asyncio.iscoroutinefunction(check):
-                result = await check()
+                result = await asyncio.wait_for(check(), timeout)
             else:
                 result = check()
 
@@ -363,6 +375,13 @@ class HealthChecker:
                     details={"result": str(result)}
                 )
 
+        except asyncio.TimeoutError:
+            return HealthCheckResult(
+                name=name,
+                status=HealthStatus.UNHEALTHY,
+                latency_ms=(time.time() - start_time) * 1000,
+                message="timeout"
+            )
         except Exception as e:
             latency = (time.time() - start_time) * 1000
             return HealthCheckResult(
@@ -372,49 +391,107 @@ class HealthChecker:
                 message=str(e)
             )
 
+    def _is_fresh(self) -> bool:
+        return (
+            self._last_check is not None
+            and time.monotonic() - self._last_check_time < self._check_interval
+        )
+
+    def seconds_until_stale(self) -> int:
+        """Seconds the cached check result remains valid"""
+        if self._last_check is None:
+            return 0
+        remaining = self._check_interval - (time.monotonic() - self._last_check_time)
+        return max(0, int(remaining))
+
     async def run_all_checks(self, force: bool = False) -> dict:
         """Run all health checks"""
-        now = time.time()
-
         # Use cached result if not expired
-        if not force and self._last_check and (now - self._last_check_time) < self._check_interval:
+        if not force and self._is_fresh():
             return self._last_check
 
-        results = []
+        # Concurrent probes wait for one run instead of each checking every component
+        async with self._check_lock:
+            if not force and self._is_fresh():
+                return self._last_check
+            return await self._run_checks()
+
+    async def run_all_checks_encoded(self, force: bool = False) -> tuple[dict, bytes]:
+        """Run all health checks, also returning the result encoded as JSON"""
+        result = await self.run_all_checks(force)
+        return result, self._last_check_body
+
+    async def _run_checks(self) -> dict:
+        now = time.time()
         overall_status = HealthStatus.HEALTHY
 
-        for name, check in self._checks.items():
-            result = await self.check_component(name, check)
-            results.append(result)
+        # Checks run concurrently, so a probe takes as long as the slowest
+        # check, which its timeout caps
+        results = await asyncio.gather(*(
+            self.check_component(name, check, self._timeouts.get(name))
+            for name, check in self._checks.items()
+        ))
+
+        if self.enable_stale_fallback:
+            results = [self._apply_stale_fallback(r) for r in results]
+
+        # Update metrics, roll up the overall status and build the report in one pass
+        checks = []
+        for name, result in zip(self._checks, results, strict=True):
+            status = result.status
 
             # Update Prometheus metric
             SERVICE_HEALTH.labels(service=name).set(
-                1 if result.status == HealthStatus.HEALTHY else 0
+                1 if status is HealthStatus.HEALTHY else 0
             )
 
-            if result.status == HealthStatus.UNHEALTHY:
+            if status is HealthStatus.UNHEALTHY:
                 overall_status = HealthStatus.UNHEALTHY
-            elif result.status == HealthStatus.DEGRADED and overall_status == HealthStatus.HEALTHY:
+            elif status is HealthStatus.DEGRADED and overall_status is HealthStatus.HEALTHY:
                 overall_status = HealthStatus.DEGRADED
 
+            checks.append({
+                "name": result.name,
+                "status": status.value,
+                "latency_ms": round(result.latency_ms, 2),
+                "message": result.message,
+                "details": result.details
+            })
+
         self._last_check = {
             "status": overall_status.value,
             "timestamp": now,
-            "checks": [
-                {
-                    "name": r.name,
-                    "status": r.status.value,
-                    "latency_ms": round(r.latency_ms, 2),
-                    "message": r.message,
-                    "details": r.details
-                }
-                for r in results
-            ]
+            "checks": checks,
         }
-        self._last_check_time = now
+        self._last_check_body = json.dumps(self._last_check, default=str).encode()
+        self._last_check_time = time.monotonic()
 
         return self._last_check
 
+    def _apply_stale_fallback(self, result: HealthCheckResult) -> HealthCheckResult:
+        """Swap a transient failure for the last healthy result, marked stale"""
+        now = time.monotonic()
+        if result.status == HealthStatus.HEALTHY:
+            self._last_good[result.name] = (result, now)
+            return result
+
+        last_good = self._last_good.get(result.name)
+        if (
+            result.status != HealthStatus.UNHEALTHY
+            or last_good is None
+            or now - last_good[1] >= self.stale_grace
+        ):
+            return result
+
+        good = last_good[0]
+        return HealthCheckResult(
+            name=result.name,
+            status=HealthStatus.DEGRADED,
+            latency_ms=result.latency_ms,
+            message=f"stale: {result.message}",
+            details={**good.details, "stale": True},
+        )
+
     async def liveness_check(self) -> dict:
         """Simple liveness check (is the service running?)"""
         return {
@@ -443,6 +520,11 @@ class SystemMetricsCollector:
     def __init__(self):
         self._running = False
         self._task = None
+        self._platform_info: Optional[dict] = None
+        # Latest readings from the collect loop, reused by get_system_info()
+        self._cpu_percent = 0.0
+        self._memory = None
+        self._disk = None
 
     async def start(self, interval: int = 15):
         """Start collecting system metrics"""
@@ -474,33 +556,45 @@ class SystemMetricsCollector:
     def _collect_metrics(self):
         """Collect current system metrics"""
         # CPU
-        SYSTEM_CPU.set(psutil.cpu_percent())
+        self._cpu_percent = psutil.cpu_percent()
+        SYSTEM_CPU.set(self._cpu_percent)
 
         # Memory
-        memory = psutil.virtual_memory()
-        SYSTEM_MEMORY.set(memory.percent)
+        self._memory = psutil.virtual_memory()
+        SYSTEM_MEMORY.set(self._memory.percent)
 
         # Disk
-        disk = psutil.disk_usage('/')
-        SYSTEM_DISK.set(disk.percent)
+        self._disk = psutil.disk_usage('/')
+        SYSTEM_DISK.set(self._disk.percent)
 
     def get_system_info(self) -> dict:
         """Get current system information"""
+        # Platform details never change while the process runs
+        if self._platform_info is None:
+            self._platform_info = {
+                "platform": platform.system(),
+                "platform_release": platform.release(),
+                "platform_version": platform.version(),
+                "architecture": platform.machine(),
+                "processor": platform.processor(),
+                "python_version": platform.python_version(),
+                "cpu_count": psutil.cpu_count(),
+            }
+
+        # Serve the collector's last readings; sample directly only before its first run
+        if self._memory is None:
+            self._collect_metrics()
+        memory, disk = self._memory, self._disk
+
         return {
-            "platform": platform.system(),
-            "platform_release": platform.release(),
-            "platform_version": platform.version(),
-            "architecture": platform.machine(),
-            "processor": platform.processor(),
-            "python_version": platform.python_version(),
-            "cpu_count": psutil.cpu_count(),
-            "cpu_percent": psutil.cpu_percent(),
-            "memory_total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-            "memory_available_gb": round(psutil.virtual_memory().available / (1024**3), 2),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_total_gb": round(psutil.disk_usage('/').total / (1024**3), 2),
-            "disk_free_gb": round(psutil.disk_usage('/').free / (1024**3), 2),
-            "disk_percent": psutil.disk_usage('/').percent,
+            **self._platform_info,
+            "cpu_percent": self._cpu_percent,
+            "memory_total_gb": round(memory.total / (1024**3), 2),
+            "memory_available_gb": round(memory.available / (1024**3), 2),
+            "memory_percent": memory.percent,
+            "disk_total_gb": round(disk.total / (1024**3), 2),
+            "disk_free_gb": round(disk.free / (1024**3), 2),
+            "disk_percent": disk.percent,
         }
 
 
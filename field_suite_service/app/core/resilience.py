@@ -5,6 +5,7 @@ Resilience Patterns for Sahool Yemen
 Circuit Breaker, Retry Logic, and Fault Tolerance
 """
 import asyncio
+import random
 import time
 from enum import Enum
 from typing import TypeVar, Callable, Optional
@@ -211,16 +212,20 @@ class RetryHandler:
 
     def __init__(self, config: Optional[RetryConfig] = None):
         self.config = config or RetryConfig()
+        # Backoff schedule is fixed by the config, so compute it once
+        self._delays = tuple(
+            min(
+                self.config.base_delay * (self.config.exponential_base ** attempt),
+                self.config.max_delay
+            )
+            for attempt in range(max(self.config.max_attempts - 1, 0))
+        )
 
     def _calculate_delay(self, attempt: int) -> float:
         """Calculate delay for current attempt"""
-        delay = min(
-            self.config.base_delay * (self.config.exponential_base ** attempt),
-            self.config.max_delay
-        )
+        delay = self._delays[attempt]
 
         if self.config.jitter:
-            import random
             delay = delay * (0.5 + random.random())
 
         return delay
@@ -16,7 +16,7 @@ from typing import Optional
 
 from fastapi import FastAPI, Request, HTTPException, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
 import structlog
@@ -113,9 +113,11 @@ async def lifespan(app: FastAPI):
     await ws_background_tasks.start()
     await system_metrics.start()
 
-    # Register health checks
+    # Register health checks; a check that just turned unhealthy is reported
+    # as degraded while its last healthy result is recent
+    health_checker.enable_stale_fallback = True
     health_checker.register("http_client", lambda: {"healthy": http_client is not None})
-    health_checker.register("cache", lambda: cache_manager.get_stats())
+    health_checker.register("cache", cache_manager.health_check)
     health_checker.register("websocket", lambda: connection_manager.get_stats())
 
     # Set application info for metrics
@@ -194,18 +196,45 @@ async def health_check():
     }
 
 
+# Liveness never runs checks, so its body is fixed
+_LIVE_BYTES = b'{"status":"alive"}'
+
+
 @app.get("/health/ready", tags=["Health"])
 async def readiness_check():
-    """Readiness check with all dependencies"""
-    result = await health_checker.run_all_checks()
+    """Readiness check with all dependencies (cached between runs)"""
+    result, body = await health_checker.run_all_checks_encoded()
+    # Degraded components still serve traffic, so only unhealthy fails readiness
+    status_code = 503 if result["status"] == "unhealthy" else 200
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Cache-Control": f"max-age={health_checker.seconds_until_stale()}"},
+    )
+
+
+@app.get("/health/deep", tags=["Health"])
+async def deep_health_check():
+    """Run every dependency check now, bypassing the cached result"""
+    result, body = await health_checker.run_all_checks_encoded(force=True)
     status_code = 200 if result["status"] == "healthy" else 503
-    return JSONResponse(content=result, status_code=status_code)
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
 
 
 @app.get("/health/live", tags=["Health"])
 async def liveness_check():
     """Liveness check"""
-    return await health_checker.liveness_check()
+    return Response(
+        content=_LIVE_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
 
 
 # =============================================================================
@@ -471,7 +500,7 @@ async def broadcast_weather(region_id: int, weather: dict):
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -485,7 +514,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error("unhandled_exception", error=str(exc), path=request.url.path)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
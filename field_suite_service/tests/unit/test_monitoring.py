@@ -0,0 +1,78 @@
+"""
+Unit tests for the health checker
+سهول اليمن - اختبارات فاحص الصحة
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.core import monitoring
+from app.core.monitoring import HealthChecker
+
+
+class FakeClock:
+    """Stands in for the time module inside app.core.monitoring"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+class TestStaleFallback:
+    """Test stale-while-error fallback of the health checker"""
+
+    @pytest.fixture
+    def clock(self):
+        clock = FakeClock()
+        with patch.object(monitoring, "time", clock):
+            yield clock
+
+    @pytest.fixture
+    def state(self):
+        return {"healthy": True}
+
+    @pytest.fixture
+    def checker(self, state):
+        checker = HealthChecker(enable_stale_fallback=True)
+        checker.register("db", lambda: {"healthy": state["healthy"], "message": "down"})
+        return checker
+
+    def test_recent_healthy_check_is_reported_stale(self, clock, state, checker):
+        """A failure one check interval after a healthy run should be degraded, not unhealthy"""
+        assert asyncio.run(checker.run_all_checks())["status"] == "healthy"
+
+        state["healthy"] = False
+        clock.now += checker._check_interval
+        result = asyncio.run(checker.run_all_checks())
+
+        assert result["status"] == "degraded"
+        check = result["checks"][0]
+        assert check["message"] == "stale: down"
+        assert check["details"]["stale"] is True
+
+    def test_failure_past_grace_is_unhealthy(self, clock, state, checker):
+        """A failure after the grace period should be reported as unhealthy"""
+        asyncio.run(checker.run_all_checks())
+
+        state["healthy"] = False
+        clock.now += checker.stale_grace
+        result = asyncio.run(checker.run_all_checks())
+
+        assert result["status"] == "unhealthy"
+        assert result["checks"][0]["message"] == "down"
+
+    def test_fallback_disabled_by_default(self, clock, state):
+        """Without the fallback a failure is reported as unhealthy right away"""
+        checker = HealthChecker()
+        checker.register("db", lambda: {"healthy": state["healthy"]})
+        asyncio.run(checker.run_all_checks())
+
+        state["healthy"] = False
+        clock.now += checker._check_interval
+
+        assert asyncio.run(checker.run_all_checks())["status"] == "unhealthy"
@@ -4,7 +4,8 @@ FastAPI Authentication Dependencies
 """
 
 from typing import Annotated, Optional
-from functools import wraps
+from functools import cached_property, wraps
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -25,6 +26,11 @@ class AuthenticatedUser:
         self.token_id = payload.jti
         self._payload = payload
 
+    @cached_property
+    def tenant_uuid(self) -> UUID:
+        """Tenant ID parsed once per request for use in queries."""
+        return UUID(self.tenant_id)
+
     @property
     def is_admin(self) -> bool:
         return self.role == "admin"
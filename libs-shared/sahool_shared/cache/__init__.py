@@ -8,6 +8,7 @@ from sahool_shared.cache.redis_cache import (
     get_cache,
     cache_key,
     cached,
+    cache_response,
 )
 
 __all__ = [
@@ -15,4 +16,5 @@ __all__ = [
     "get_cache",
     "cache_key",
     "cached",
+    "cache_response",
 ]
@@ -3,8 +3,11 @@ Redis Cache Implementation
 تنفيذ التخزين المؤقت Redis
 """
 
+import asyncio
 import json
 import hashlib
+import time
+from collections import OrderedDict
 from functools import wraps
 from typing import Any, Callable, Optional, TypeVar, Union
 import os
@@ -82,16 +85,36 @@ class RedisCache:
             value = json.dumps(value, ensure_ascii=False)
         return await self.client.set(self._make_key(key), value, ex=ttl)
 
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get raw bytes value from cache."""
+        value = await self.get(key)
+        if value is None:
+            return None
+        return value.encode() if isinstance(value, str) else value
+
+    async def set_bytes(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        """Set raw bytes value in cache."""
+        return await self.client.set(self._make_key(key), value, ex=ttl or self.default_ttl)
+
     async def delete(self, key: str) -> int:
         """Delete key from cache."""
         return await self.client.delete(self._make_key(key))
 
-    async def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern."""
-        keys = await self.client.keys(self._make_key(pattern))
+    async def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        Delete all keys matching pattern.
+        Walks the keyspace with SCAN rather than KEYS so Redis is never blocked.
+        """
+        deleted = 0
+        keys = []
+        async for key in self.client.scan_iter(match=self._make_key(pattern), count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                deleted += await self.client.delete(*keys)
+                keys.clear()
         if keys:
-            return await self.client.delete(*keys)
-        return 0
+            deleted += await self.client.delete(*keys)
+        return deleted
 
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
@@ -120,7 +143,6 @@ class RedisCache:
         Check rate limit.
         Returns (allowed, current_count).
         """
-        import time
         current = int(time.time())
         window_key = f"ratelimit:{key}:{current // window}"
 
@@ -132,6 +154,24 @@ class RedisCache:
         count = results[0]
         return count <= limit, count
 
+    async def rate_limit_add(
+        self,
+        hits: dict[str, int],
+        window: int = 60,
+    ) -> None:
+        """
+        Add locally counted hits to the current rate limit windows.
+        Uses the same keys as rate_limit_check, in a single pipeline.
+        """
+        current = int(time.time())
+
+        pipe = self.client.pipeline()
+        for key, amount in hits.items():
+            window_key = self._make_key(f"ratelimit:{key}:{current // window}")
+            pipe.incrby(window_key, amount)
+            pipe.expire(window_key, window + 10)
+        await pipe.execute()
+
     # Token blacklist helpers
     async def blacklist_token(self, jti: str, ttl: int) -> bool:
         """Add token to blacklist."""
@@ -155,6 +195,48 @@ async def get_cache() -> RedisCache:
     return _cache
 
 
+# Per-process map of cache keys currently being computed by `cached` and `cache_response`
+_inflight: dict[str, asyncio.Future] = {}
+
+# Flight result telling `cached` waiters the leader was cancelled and they should call for themselves
+_RELEASED = object()
+
+
+class _LocalCache:
+    """
+    In-process LRU with a fixed TTL, used as a tier in front of Redis.
+    Disabled when ttl is 0.
+    """
+
+    def __init__(self, ttl: int, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from arguments."""
     key_data = f"{args}:{sorted(kwargs.items())}"
@@ -165,39 +247,211 @@ def cached(
     ttl: int = 3600,
     prefix: str = "cache",
     key_builder: Optional[Callable[..., str]] = None,
+    local_ttl: int = 0,
+    local_maxsize: int = 1024,
 ):
     """
     Decorator for caching function results.
     مزخرف لتخزين نتائج الدالة مؤقتاً
 
+    Concurrent misses for the same key within a worker share a single call
+    to the wrapped function instead of each recomputing the value.
+
+    With local_ttl set, up to local_maxsize results are also kept in process
+    memory for local_ttl seconds and served without a Redis round-trip.
+    Keep local_ttl well below ttl, since other workers cannot invalidate it.
+
     Usage:
         @cached(ttl=300, prefix="weather")
         async def get_weather(lat: float, lon: float):
             ...
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        local = _LocalCache(local_ttl, local_maxsize)
+
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
-            cache = await get_cache()
-
             # Build cache key
             if key_builder:
                 key = key_builder(*args, **kwargs)
             else:
                 key = f"{prefix}:{func.__name__}:{cache_key(*args, **kwargs)}"
 
+            # Try the in-process cache first
+            local_value = local.get(key)
+            if local_value is not None:
+                return local_value
+
+            cache = await get_cache()
+
             # Try to get from cache
             cached_value = await cache.get_json(key)
             if cached_value is not None:
+                local.set(key, cached_value)
                 return cached_value
 
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-
-            # Cache the result
-            await cache.set(key, result, ttl)
+            # Wait for a call already computing this key
+            flight = _inflight.get(key)
+            if flight is not None:
+                result = await asyncio.shield(flight)
+                if result is not _RELEASED:
+                    return result
+                return await func(*args, **kwargs)
+
+            flight = asyncio.get_running_loop().create_future()
+            _inflight[key] = flight
+            try:
+                # Call function and cache result
+                result = await func(*args, **kwargs)
+
+                # Cache the result (Pydantic models are stored as their JSON form)
+                if hasattr(result, "model_dump"):
+                    await cache.set(key, result.model_dump(mode="json"), ttl)
+                else:
+                    await cache.set(key, result, ttl)
+            except Exception as e:
+                flight.set_exception(e)
+                # Mark as retrieved so a flight without waiters doesn't warn
+                flight.exception()
+                raise
+            except BaseException:
+                # Cancellation belongs to the leader's caller only; release the waiters
+                flight.set_result(_RELEASED)
+                raise
+            else:
+                flight.set_result(result)
+                local.set(key, result)
+            finally:
+                _inflight.pop(key, None)
 
             return result
 
         return wrapper
     return decorator
+
+
+def cache_response(
+    ttl: int = 60,
+    key_fn: Optional[Callable[..., str]] = None,
+    local_ttl: int = 0,
+    local_maxsize: int = 1024,
+    model: Optional[type] = None,
+):
+    """
+    Decorator for caching FastAPI endpoint responses as encoded JSON.
+    مزخرف لتخزين استجابات نقاط النهاية مؤقتاً
+
+    The key is the function name plus key_fn(**kwargs), or a hash of the
+    arguments. Cached bodies are served as-is without re-encoding. Redis
+    errors fall through to the endpoint. Concurrent misses for the same key
+    within a worker share one call to the endpoint; each caller still gets
+    its own Response. Call `await endpoint.invalidate()` to drop all cached
+    responses for an endpoint.
+
+    Because a Response is returned, FastAPI does not apply the route's
+    response_model; pass the same model as `model` to validate results
+    against it before they are encoded. Responses other than a buffered
+    200 (errors, streaming or file responses) are returned uncached.
+
+    With local_ttl set, encoded bodies are also kept in process memory as in
+    `cached`; invalidate() only clears the calling worker's copy.
+
+    Usage:
+        @app.get("/api/v1/dashboard/stats", response_model=DashboardStats)
+        @cache_response(ttl=60, model=DashboardStats)
+        async def get_dashboard_stats(user_id: str | None = None):
+            ...
+    """
+    from fastapi.encoders import jsonable_encoder
+    from starlette.responses import Response
+
+    def encode(result: Any) -> Optional[bytes]:
+        """Encode an endpoint result, or return None if it must not be cached."""
+        if isinstance(result, Response):
+            body = getattr(result, "body", None)
+            return body if result.status_code == 200 and body is not None else None
+        if model is not None and not isinstance(result, model):
+            result = model.model_validate(result)
+        if hasattr(result, "model_dump_json"):
+            # Pydantic encodes its own models without the generic encoder
+            return result.model_dump_json().encode()
+        return json.dumps(jsonable_encoder(result), ensure_ascii=False).encode()
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        prefix = f"resp:{func.__name__}"
+        local = _LocalCache(local_ttl, local_maxsize)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key_fn:
+                suffix = key_fn(*args, **kwargs)
+            else:
+                key_data = json.dumps([args, kwargs], sort_keys=True, default=str)
+                suffix = hashlib.blake2b(key_data.encode(), digest_size=16).hexdigest()
+            key = f"{prefix}:{suffix}"
+
+            body = local.get(key)
+            if body is not None:
+                return Response(content=body, media_type="application/json")
+
+            try:
+                cache = await get_cache()
+                body = await cache.get_bytes(key)
+                if body is not None:
+                    local.set(key, body)
+                    return Response(content=body, media_type="application/json")
+            except Exception:
+                cache = None
+
+            # Wait for a call already computing this key; it shares the encoded
+            # body, or None when its result was not cacheable or it was cancelled
+            flight = _inflight.get(key)
+            if flight is not None:
+                body = await asyncio.shield(flight)
+                if body is not None:
+                    return Response(content=body, media_type="application/json")
+                result = await func(*args, **kwargs)
+                body = encode(result)
+                if body is None:
+                    return result
+                return Response(content=body, media_type="application/json")
+
+            flight = asyncio.get_running_loop().create_future()
+            _inflight[key] = flight
+            try:
+                result = await func(*args, **kwargs)
+                body = encode(result)
+
+                if body is not None:
+                    local.set(key, body)
+                    if cache is not None:
+                        try:
+                            await cache.set_bytes(key, body, ttl)
+                        except Exception:
+                            pass
+            except Exception as e:
+                flight.set_exception(e)
+                # Mark as retrieved so a flight without waiters doesn't warn
+                flight.exception()
+                raise
+            except BaseException:
+                # Cancellation belongs to the leader's caller only; release the waiters
+                flight.set_result(None)
+                raise
+            else:
+                flight.set_result(body)
+            finally:
+                _inflight.pop(key, None)
+
+            if body is None:
+                return result
+            return Response(content=body, media_type="application/json")
+
+        async def invalidate() -> int:
+            local.clear()
+            cache = await get_cache()
+            return await cache.delete_pattern(f"{prefix}:*")
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
@@ -0,0 +1,51 @@
+"""
+CORS Configuration
+إعدادات CORS المشتركة
+"""
+
+import os
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+# Explicit whitelists let CORSMiddleware answer preflights without
+# reflecting the requested headers back
+CORS_ALLOW_HEADERS = [
+    "Authorization",
+    "Content-Type",
+    "Accept-Language",
+    "X-Request-ID",
+    "X-Tenant-ID",
+    "X-API-Key",
+]
+CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+CORS_MAX_AGE = 86400  # Browsers may cache preflight results for a day
+
+
+def get_cors_origins() -> list[str]:
+    """Parse allowed origins from the comma separated CORS_ORIGINS variable."""
+    return [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
+
+
+def install_cors(app: FastAPI, origins: Optional[list[str]] = None) -> list[str]:
+    """
+    Add CORSMiddleware to an app using the platform defaults.
+    إضافة CORS إلى التطبيق
+
+    Credentials are only allowed when specific origins are configured;
+    otherwise the wildcard origin is used without credentials.
+    Returns the configured origins (empty when falling back to '*').
+    """
+    if origins is None:
+        origins = get_cors_origins()
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins or ["*"],
+        allow_credentials=bool(origins),
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
+        max_age=CORS_MAX_AGE,
+    )
+    return origins
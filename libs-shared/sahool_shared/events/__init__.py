@@ -7,6 +7,7 @@ from sahool_shared.events.event_bus import (
     Event,
     EventBus,
     EventHandler,
+    close_event_bus,
     get_event_bus,
     publish_event,
     subscribe,
@@ -24,6 +25,7 @@ __all__ = [
     "Event",
     "EventBus",
     "EventHandler",
+    "close_event_bus",
     "get_event_bus",
     "publish_event",
     "subscribe",
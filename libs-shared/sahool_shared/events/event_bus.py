@@ -115,17 +115,30 @@ class RedisEventBus(EventBus):
         self,
         url: Optional[str] = None,
         channel_prefix: str = "sahool:events",
+        max_connections: int = 20,
+        pool_timeout: int = 5,
     ):
         self.url = url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.channel_prefix = channel_prefix
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self._pool: Optional[redis.BlockingConnectionPool] = None
         self._client: Optional[redis.Redis] = None
         self._pubsub: Optional[redis.client.PubSub] = None
         self._handlers: Dict[str, List[EventHandler]] = {}
         self._listener_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
-        """Connect to Redis."""
-        self._client = redis.from_url(self.url, decode_responses=True)
+        """Connect to Redis using a bounded, shared connection pool."""
+        # Callers wait up to pool_timeout for a free connection instead of
+        # failing as soon as max_connections are in use
+        self._pool = redis.BlockingConnectionPool.from_url(
+            self.url,
+            decode_responses=True,
+            max_connections=self.max_connections,
+            timeout=self.pool_timeout,
+        )
+        self._client = redis.Redis(connection_pool=self._pool)
         self._pubsub = self._client.pubsub()
         await self._client.ping()
 
@@ -137,6 +150,8 @@ class RedisEventBus(EventBus):
             await self._pubsub.close()
         if self._client:
             await self._client.close()
+        if self._pool:
+            await self._pool.disconnect()
 
     def _channel_name(self, event_type: str) -> str:
         """Get channel name for event type."""
@@ -149,10 +164,12 @@ class RedisEventBus(EventBus):
 
         channel = self._channel_name(event.type)
         message = event.json()
-        await self._client.publish(channel, message)
 
-        # Also publish to wildcard channel
-        await self._client.publish(f"{self.channel_prefix}:*", message)
+        # Publish to the event channel and the wildcard channel in one round trip
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.publish(channel, message)
+            pipe.publish(f"{self.channel_prefix}:*", message)
+            await pipe.execute()
 
     async def subscribe(self, event_type: str, handler: EventHandler) -> None:
         """Subscribe to event type."""
@@ -221,13 +238,23 @@ async def get_event_bus() -> EventBus:
     if _event_bus is None:
         redis_url = os.getenv("REDIS_URL")
         if redis_url:
-            _event_bus = RedisEventBus(url=redis_url)
-            await _event_bus.connect()
+            # Only keep a connected bus, so a failed connect is retried on next use
+            bus = RedisEventBus(url=redis_url)
+            await bus.connect()
+            _event_bus = bus
         else:
             _event_bus = InMemoryEventBus()
     return _event_bus
 
 
+async def close_event_bus() -> None:
+    """Close the global event bus, e.g. from an application lifespan handler."""
+    global _event_bus
+    if isinstance(_event_bus, RedisEventBus):
+        await _event_bus.disconnect()
+    _event_bus = None
+
+
 async def publish_event(event: Event) -> None:
     """Convenience function to publish event."""
     bus = await get_event_bus()
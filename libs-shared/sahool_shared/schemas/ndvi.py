@@ -94,16 +94,14 @@ class NDVITimeline(BaseSchema):
         if len(values) < 3:
             return "stable"
 
-        # Simple linear regression
+        # Simple linear regression over x = 0..n-1. The centred x values sum
+        # to zero, so the y mean drops out of the numerator and the
+        # denominator has the closed form n(n^2 - 1)/12: one pass over values
         n = len(values)
         x_mean = (n - 1) / 2
-        y_mean = sum(values) / n
 
-        numerator = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(values))
-        denominator = sum((i - x_mean) ** 2 for i in range(n))
-
-        if denominator == 0:
-            return "stable"
+        numerator = sum((i - x_mean) * v for i, v in enumerate(values))
+        denominator = n * (n * n - 1) / 12
 
         slope = numerator / denominator
 
@@ -28,9 +28,10 @@ class DatabaseManager:
     def __init__(
         self,
         url: Optional[str] = None,
-        pool_size: int = 20,
-        max_overflow: int = 50,
-        pool_recycle: int = 3600,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_recycle: Optional[int] = None,
+        query_cache_size: int = 1200,
         echo: bool = False,
     ):
         self.url = url or os.getenv(
@@ -45,9 +46,16 @@ class DatabaseManager:
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
-        self.pool_size = pool_size
-        self.max_overflow = max_overflow
-        self.pool_recycle = pool_recycle
+        # Pools are per worker process; size them with DB_POOL_SIZE and
+        # DB_MAX_OVERFLOW so workers x (size + overflow) fits max_connections
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("DB_POOL_SIZE", "20"))
+        self.max_overflow = (
+            max_overflow if max_overflow is not None else int(os.getenv("DB_MAX_OVERFLOW", "40"))
+        )
+        self.pool_recycle = (
+            pool_recycle if pool_recycle is not None else int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        )
+        self.query_cache_size = query_cache_size
         self.echo = echo
 
     async def connect(self) -> None:
@@ -62,6 +70,9 @@ class DatabaseManager:
             max_overflow=self.max_overflow,
             pool_recycle=self.pool_recycle,
             pool_pre_ping=True,
+            # Compiled SQL cache shared by every session; sized above the
+            # default 500 so all services' statement shapes stay cached
+            query_cache_size=self.query_cache_size,
             echo=self.echo,
         )
 
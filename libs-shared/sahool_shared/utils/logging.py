@@ -3,12 +3,19 @@ Logging Utilities
 أدوات التسجيل
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 import structlog
 
+# Background thread writing queued log records to stdout
+_log_listener: Optional[QueueListener] = None
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
 
 def setup_logging(
     level: str = "INFO",
@@ -19,12 +26,20 @@ def setup_logging(
     Setup structured logging with structlog.
     إعداد التسجيل المنظم مع structlog
     """
+    global _log_listener
     log_level = getattr(logging, level.upper(), logging.INFO)
 
+    # Request handlers only enqueue records; a listener thread does the
+    # stdout writes, so a slow log consumer never blocks the event loop
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
     # Configure standard logging
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
+        handlers=[QueueHandler(_log_queue)],
         level=log_level,
     )
 
@@ -54,7 +69,7 @@ def setup_logging(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
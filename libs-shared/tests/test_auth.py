@@ -9,6 +9,7 @@ from uuid import uuid4
 
 from jose import jwt, JWTError
 
+from sahool_shared.auth.dependencies import AuthenticatedUser
 from sahool_shared.auth.jwt import JWTHandler, TokenPayload
 from sahool_shared.auth.password import hash_password, verify_password, needs_rehash
 
@@ -177,3 +178,22 @@ class TestTokenPayload:
         assert payload.sub == "user-123"
         assert payload.tenant_id == "tenant-456"
         assert payload.role == "admin"
+
+
+class TestAuthenticatedUser:
+    """Tests for AuthenticatedUser."""
+
+    def test_tenant_uuid_is_parsed_once(self):
+        """Test tenant_uuid parses the tenant ID and caches the result."""
+        tenant_id = uuid4()
+        user = AuthenticatedUser(TokenPayload(
+            sub=str(uuid4()),
+            tenant_id=str(tenant_id),
+            role="viewer",
+            exp=datetime.utcnow() + timedelta(hours=1),
+            iat=datetime.utcnow(),
+            jti="unique-token-id",
+        ))
+
+        assert user.tenant_uuid == tenant_id
+        assert user.tenant_uuid is user.tenant_uuid
@@ -0,0 +1,314 @@
+"""
+Tests for Cache Module
+اختبارات وحدة التخزين المؤقت
+"""
+
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from starlette.responses import Response, StreamingResponse
+
+from sahool_shared.cache import redis_cache
+from sahool_shared.cache.redis_cache import _LocalCache, cache_response, cached
+
+
+class FakeCache:
+    """In-memory stand-in for RedisCache."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get_json(self, key):
+        value = self.store.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key, value, ttl=None):
+        self.store[key] = json.dumps(value)
+        return True
+
+    async def get_bytes(self, key):
+        return self.store.get(key)
+
+    async def set_bytes(self, key, value, ttl=None):
+        self.store[key] = value
+        return True
+
+    async def delete_pattern(self, pattern):
+        prefix = pattern.rstrip("*")
+        keys = [key for key in self.store if key.startswith(prefix)]
+        for key in keys:
+            del self.store[key]
+        return len(keys)
+
+
+class FakeClock:
+    """Stands in for the time module inside redis_cache."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    """Route get_cache() to an in-memory cache."""
+    cache = FakeCache()
+
+    async def get_fake_cache():
+        return cache
+
+    monkeypatch.setattr(redis_cache, "get_cache", get_fake_cache)
+    return cache
+
+
+class Stats(BaseModel):
+    total: int
+
+
+class TestLocalCache:
+    """Tests for the in-process cache tier."""
+
+    def test_get_returns_value_until_expiry(self, monkeypatch):
+        """Test values expire after the TTL."""
+        clock = FakeClock()
+        monkeypatch.setattr(redis_cache, "time", clock)
+        local = _LocalCache(ttl=10, maxsize=8)
+
+        local.set("a", 1)
+        assert local.get("a") == 1
+
+        clock.now += 10
+        assert local.get("a") is None
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the least recently used entry is dropped past maxsize."""
+        local = _LocalCache(ttl=60, maxsize=2)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        """Test nothing is stored when ttl is 0."""
+        local = _LocalCache(ttl=0, maxsize=8)
+        local.set("a", 1)
+        assert local.get("a") is None
+
+
+class TestCached:
+    """Tests for the cached decorator."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, fake_cache):
+        """Test the second call is served from the cache."""
+        calls = []
+
+        @cached(ttl=60, key_builder=lambda x: f"square:{x}")
+        async def square(x):
+            calls.append(x)
+            return {"value": x * x}
+
+        assert await square(3) == {"value": 9}
+        assert await square(3) == {"value": 9}
+        assert calls == [3]
+        assert "square:3" in fake_cache.store
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self, fake_cache):
+        """Test concurrent misses for one key call the function once."""
+        calls = []
+        gate = asyncio.Event()
+
+        @cached(ttl=60, key_builder=lambda x: f"slow:{x}")
+        async def slow(x):
+            calls.append(x)
+            await gate.wait()
+            return {"value": x}
+
+        tasks = [asyncio.create_task(slow(1)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await asyncio.gather(*tasks) == [{"value": 1}] * 3
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_waiter(self, fake_cache):
+        """Test a failing call raises for all coalesced callers and caches nothing."""
+        gate = asyncio.Event()
+
+        @cached(ttl=60, key_builder=lambda: "broken")
+        async def broken():
+            await gate.wait()
+            raise ValueError("boom")
+
+        tasks = [asyncio.create_task(broken()) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert fake_cache.store == {}
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_releases_waiters(self, fake_cache):
+        """Test cancelling the leading call makes waiters call the function instead of failing."""
+        calls = []
+        gate = asyncio.Event()
+
+        @cached(ttl=60, key_builder=lambda: "cancelled")
+        async def slow():
+            calls.append(1)
+            await gate.wait()
+            return {"value": len(calls)}
+
+        leader = asyncio.create_task(slow())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(slow())
+        await asyncio.sleep(0)
+        leader.cancel()
+        gate.set()
+
+        assert await waiter == {"value": 2}
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert len(calls) == 2
+
+
+class TestCacheResponse:
+    """Tests for the cache_response decorator."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, fake_cache):
+        """Test the encoded body is stored and served on the next call."""
+        calls = []
+
+        @cache_response(ttl=60)
+        async def stats(user_id=None):
+            calls.append(user_id)
+            return Stats(total=5)
+
+        first = await stats(user_id="u1")
+        second = await stats(user_id="u1")
+
+        assert first.body == second.body == b'{"total":5}'
+        assert calls == ["u1"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_get_their_own_response(self, fake_cache):
+        """Test coalesced callers share the body but not the Response object."""
+        calls = []
+        gate = asyncio.Event()
+
+        @cache_response(ttl=60)
+        async def stats():
+            calls.append(1)
+            await gate.wait()
+            return {"total": 1}
+
+        tasks = [asyncio.create_task(stats()) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        responses = await asyncio.gather(*tasks)
+
+        assert calls == [1]
+        assert len({id(r) for r in responses}) == 3
+        assert {r.body for r in responses} == {b'{"total": 1}'}
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_and_is_not_cached(self, fake_cache):
+        """Test endpoint errors reach the caller and are retried next time."""
+        calls = []
+
+        @cache_response(ttl=60)
+        async def failing():
+            calls.append(1)
+            raise ValueError("boom")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await failing()
+        assert len(calls) == 2
+        assert fake_cache.store == {}
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_responses_are_returned_as_is(self, fake_cache):
+        """Test non-200 and streaming responses pass through uncached."""
+
+        @cache_response(ttl=60)
+        async def not_found():
+            return Response(status_code=404)
+
+        @cache_response(ttl=60)
+        async def stream():
+            return StreamingResponse(iter([b"data"]))
+
+        assert (await not_found()).status_code == 404
+        assert isinstance(await stream(), StreamingResponse)
+        assert fake_cache.store == {}
+
+    @pytest.mark.asyncio
+    async def test_results_are_validated_against_model(self, fake_cache):
+        """Test results are checked against the given model before caching."""
+
+        @cache_response(ttl=60, model=Stats)
+        async def valid():
+            return {"total": 2, "extra": "dropped"}
+
+        @cache_response(ttl=60, model=Stats)
+        async def invalid():
+            return {"total": "many"}
+
+        assert (await valid()).body == b'{"total":2}'
+        with pytest.raises(ValidationError):
+            await invalid()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_cached_responses(self, fake_cache):
+        """Test invalidate() forces the next call to recompute."""
+        calls = []
+
+        @cache_response(ttl=60, local_ttl=60)
+        async def stats():
+            calls.append(1)
+            return {"total": len(calls)}
+
+        await stats()
+        assert await stats.invalidate() == 1
+        response = await stats()
+
+        assert response.body == b'{"total": 2}'
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_releases_waiters(self, fake_cache):
+        """Test cancelling the leading request makes waiters call the endpoint instead of failing."""
+        calls = []
+        gate = asyncio.Event()
+
+        @cache_response(ttl=60)
+        async def slow():
+            calls.append(1)
+            await gate.wait()
+            return {"total": len(calls)}
+
+        leader = asyncio.create_task(slow())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(slow())
+        await asyncio.sleep(0)
+        leader.cancel()
+        gate.set()
+
+        assert (await waiter).body == b'{"total": 2}'
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert len(calls) == 2
@@ -1,11 +1,21 @@
 import httpx
 from typing import Any, Dict, Optional
 from .circuit import circuit_guard
+# One pooled client per process so keep-alive connections are reused across calls
+_shared_client: Optional[httpx.AsyncClient] = None
+def get_client() -> httpx.AsyncClient:
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(timeout=20,
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=30.0))
+    return _shared_client
+async def close_client():
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose(); _shared_client = None
 @circuit_guard("GET")
 async def get_json(url: str, params: Optional[Dict[str,Any]]=None, headers: Optional[Dict[str,str]]=None):
-    async with httpx.AsyncClient(timeout=20) as c:
-        r = await c.get(url, params=params, headers=headers); r.raise_for_status(); return r.json()
+    r = await get_client().get(url, params=params, headers=headers); r.raise_for_status(); return r.json()
 @circuit_guard("POST")
 async def post_json(url: str, json_body: Dict[str,Any], params: Optional[Dict[str,Any]]=None, headers: Optional[Dict[str,str]]=None):
-    async with httpx.AsyncClient(timeout=60) as c:
-        r = await c.post(url, json=json_body, params=params, headers=headers); r.raise_for_status(); return r.json()
\ No newline at end of file
+    r = await get_client().post(url, json=json_body, params=params, headers=headers, timeout=60); r.raise_for_status(); return r.json()
@@ -5,7 +5,10 @@ from .routes.proxy_weather import router as proxy_weather
 from .routes.proxy_soil import router as proxy_soil
 from .routes.proxy_alerts import router as proxy_alerts
 from .routes.nano_routes import router as nano_router
+from .core.http_client import close_client
 app=FastAPI(title="gateway-edge V62")
+@app.on_event("shutdown")
+async def shutdown(): await close_client()
 @app.get("/health")
 def health(): return {"status":"ok","service":"gateway-edge"}
 app.include_router(proxy_geo); app.include_router(proxy_imagery); app.include_router(proxy_weather)
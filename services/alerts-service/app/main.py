@@ -6,18 +6,15 @@ Manages agricultural alerts and notifications.
 """
 
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, HTTPException, Query  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
 
 try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
+    from sahool_shared.utils import setup_logging, get_logger
 except ImportError:
     # Fallback for standalone operation
     import logging
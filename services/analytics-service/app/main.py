@@ -6,18 +6,15 @@ Provides agricultural analytics and insights.
 """
 
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict, Any
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, Query  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
+from fastapi import FastAPI, Query
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
 
 try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
+    from sahool_shared.utils import setup_logging, get_logger
 except ImportError:
     import logging
 
@@ -6,25 +6,22 @@ Authentication and authorization service for the platform.
 """
 
 import os
-import sys
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, Depends, HTTPException, status  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from fastapi.responses import Response  # noqa: E402
-from pydantic import BaseModel, EmailStr, Field, field_validator  # noqa: E402
-from prometheus_client import Counter, Histogram, generate_latest  # noqa: E402
-from sqlalchemy import select  # noqa: E402
-from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
-
-from sahool_shared.models import User, Tenant  # noqa: E402
-from sahool_shared.models.user import UserRole, TenantPlan  # noqa: E402
-from sahool_shared.auth import (  # noqa: E402
+from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from prometheus_client import Counter, Histogram, generate_latest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sahool_shared.models import User, Tenant
+from sahool_shared.models.user import UserRole, TenantPlan
+from sahool_shared.auth import (
     hash_password,
     verify_password,
     create_access_token,
@@ -33,8 +30,8 @@ from sahool_shared.auth import (  # noqa: E402
     get_current_user,
     AuthenticatedUser,
 )
-from sahool_shared.utils import get_db, setup_logging, get_logger  # noqa: E402
-from sahool_shared.schemas.common import HealthResponse  # noqa: E402
+from sahool_shared.utils import get_db, setup_logging, get_logger
+from sahool_shared.schemas.common import HealthResponse
 
 # Metrics
 REQUEST_COUNT = Counter("auth_requests_total", "Total requests", ["endpoint", "status"])
@@ -543,7 +540,7 @@ async def get_current_tenant(
     الحصول على معلومات المنظمة الحالية
     """
     result = await db.execute(
-        select(Tenant).where(Tenant.id == UUID(current_user.tenant_id))
+        select(Tenant).where(Tenant.id == current_user.tenant_uuid)
     )
     tenant = result.scalar_one_or_none()
 
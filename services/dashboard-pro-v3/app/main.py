@@ -5,19 +5,18 @@ Sahool Yemen Platform v9.0.0
 Backend API for the professional dashboard interface.
 """
 
+import json
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict, Any
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, Query  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
+from fastapi import FastAPI, Query, Response
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
 
 try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
+    from sahool_shared.utils import setup_logging, get_logger
+    from sahool_shared.cache import cache_response
 except ImportError:
     import logging
 
@@ -27,6 +26,9 @@ except ImportError:
     def get_logger(name: str):
         return logging.getLogger(name)
 
+    def cache_response(ttl: int = 60, key_fn=None, local_ttl: int = 0, local_maxsize: int = 1024, model=None):
+        return lambda func: func
+
 logger = get_logger(__name__)
 
 
@@ -93,6 +95,30 @@ app.add_middleware(
 )
 
 
+# ============================================================
+# Stub Responses
+# ============================================================
+
+# Placeholder payloads for endpoints that are not implemented yet,
+# encoded once so each call only copies bytes
+_STUB_BYTES = {
+    "layouts": json.dumps(
+        {"success": True, "layouts": [], "message": "Layout management not yet implemented"}
+    ).encode(),
+    "widget_data": json.dumps(
+        {"success": True, "data": None, "message": "Widget data retrieval not yet implemented"}
+    ).encode(),
+    "activity_feed": json.dumps(
+        {"success": True, "activities": [], "message": "Activity feed not yet implemented"}
+    ).encode(),
+}
+
+
+def stub_response(name: str) -> Response:
+    """Build a JSON response from a pre-encoded stub payload."""
+    return Response(content=_STUB_BYTES[name], media_type="application/json")
+
+
 # ============================================================
 # Health Check
 # ============================================================
@@ -108,6 +134,7 @@ async def health_check():
 # ============================================================
 
 @app.get("/api/v1/dashboard/stats", response_model=DashboardStats)
+@cache_response(ttl=60, model=DashboardStats)
 async def get_dashboard_stats(user_id: Optional[str] = Query(None)):
     """
     Get dashboard statistics.
@@ -131,11 +158,7 @@ async def get_user_layouts(user_id: str = Query(...)):
     الحصول على تخطيطات لوحة التحكم
     """
     logger.info("get_user_layouts", user_id=user_id)
-    return {
-        "success": True,
-        "layouts": [],
-        "message": "Layout management not yet implemented"
-    }
+    return stub_response("layouts")
 
 
 @app.post("/api/v1/dashboard/layouts")
@@ -163,11 +186,7 @@ async def get_widget_data(
     الحصول على بيانات الودجت
     """
     logger.info("get_widget_data", widget_id=widget_id)
-    return {
-        "success": True,
-        "data": None,
-        "message": "Widget data retrieval not yet implemented"
-    }
+    return stub_response("widget_data")
 
 
 @app.get("/api/v1/dashboard/activity-feed")
@@ -180,13 +199,19 @@ async def get_activity_feed(
     الحصول على سجل النشاطات
     """
     logger.info("get_activity_feed", user_id=user_id, limit=limit)
-    return {
-        "success": True,
-        "activities": [],
-        "message": "Activity feed not yet implemented"
-    }
+    return stub_response("activity_feed")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "2")),
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
@@ -5,25 +5,37 @@ Sahool Yemen v9.0.0
 Central API Gateway for routing requests to microservices.
 """
 
+import asyncio
+import hashlib
+import json
 import os
-import sys
 import time
+import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from typing import Optional
 
-sys.path.insert(0, "/app/libs-shared")
-
-import httpx  # noqa: E402
-from fastapi import FastAPI, Request, Response, HTTPException  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from fastapi.responses import JSONResponse  # noqa: E402
-from prometheus_client import Counter, Histogram, generate_latest  # noqa: E402
-from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+import httpx
+from fastapi import Depends, FastAPI, Request, Response, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    PlatformCollector,
+    ProcessCollector,
+    generate_latest,
+    multiprocess,
+)
+from starlette.background import BackgroundTask
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
 
-from sahool_shared.auth import verify_token  # noqa: E402
-from sahool_shared.cache import get_cache  # noqa: E402
-from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
-from sahool_shared.schemas.common import HealthResponse  # noqa: E402
+from sahool_shared.auth import TokenPayload, verify_token
+from sahool_shared.cache import get_cache
+from sahool_shared.cors import install_cors
+from sahool_shared.utils import setup_logging, get_logger
 
 # Configuration
 SERVICE_ROUTES = {
@@ -37,20 +49,217 @@ SERVICE_ROUTES = {
     "/api/v1/tenants": os.getenv("AUTH_SERVICE_URL", "http://auth-service:8000"),
 }
 
+# Headers that describe a single hop and must not be copied across the proxy
+HOP_BY_HOP_HEADERS = frozenset({
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailers",
+    b"transfer-encoding",
+    b"upgrade",
+})
+REQUEST_SKIP_HEADERS = HOP_BY_HOP_HEADERS | {b"host", b"x-forwarded-for", b"x-forwarded-proto"}
+RESPONSE_SKIP_HEADERS = HOP_BY_HOP_HEADERS | {b"content-length"}
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Concurrent identical GETs share one upstream call when the body is small enough to buffer
+SINGLE_FLIGHT_MAX_KEYS = int(os.getenv("SINGLE_FLIGHT_MAX_KEYS", "1000"))
+SINGLE_FLIGHT_MAX_BODY = int(os.getenv("SINGLE_FLIGHT_MAX_BODY", str(1024 * 1024)))
+# Request headers that select the upstream representation; they are part of the
+# single-flight key, and a response varying on anything else is never shared
+SINGLE_FLIGHT_KEY_HEADERS = ("authorization", "accept", "accept-encoding", "accept-language", "origin")
+# Requests carrying other credentials or tenant selection always go upstream on their own
+SINGLE_FLIGHT_BYPASS_HEADERS = ("cookie", "x-api-key", "x-tenant-id")
+
 # Rate limiting config
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "200"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+# Local token buckets absorb traffic between Redis syncs; size them per worker process
+WORKERS = int(os.getenv("WORKERS", "2"))
+GATEWAY_REPLICAS = int(os.getenv("GATEWAY_REPLICAS", "1"))
+RATE_LIMIT_LOCAL = max(1, RATE_LIMIT_REQUESTS // (GATEWAY_REPLICAS * WORKERS))
+RATE_LIMIT_SYNC_INTERVAL = float(os.getenv("RATE_LIMIT_SYNC_INTERVAL", "1.0"))
+
+# Only emit X-Response-Time when debugging; Prometheus already records latency
+DEBUG_TIMING = os.getenv("DEBUG_TIMING", "0") == "1"
+
+# Aggregate /health/services result is reused for this many seconds
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "2"))
+
+# Request logs are queued and emitted in batches by a background task
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = 256
+
+# Verified token cache config
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "60"))
+
+# Each worker process has its own registry; with PROMETHEUS_MULTIPROC_DIR set,
+# /metrics aggregates the files every worker writes there instead, plus the
+# process and platform metrics of the worker serving the scrape
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    METRICS_REGISTRY = CollectorRegistry()
+    multiprocess.MultiProcessCollector(METRICS_REGISTRY)
+    ProcessCollector(registry=METRICS_REGISTRY)
+    PlatformCollector(registry=METRICS_REGISTRY)
+else:
+    METRICS_REGISTRY = REGISTRY
 
 # Metrics
 REQUEST_COUNT = Counter("gateway_requests_total", "Total requests", ["method", "path", "status"])
 REQUEST_LATENCY = Histogram("gateway_request_latency_seconds", "Request latency", ["method", "path"])
 UPSTREAM_LATENCY = Histogram("gateway_upstream_latency_seconds", "Upstream service latency", ["service"])
+DROPPED_LOGS = Counter("gateway_request_logs_dropped_total", "Request log events dropped on a full queue")
+
+# Metrics are labelled by route prefix rather than raw path. Latency children
+# are bound once at import time; count children are bound the first time a
+# status is seen, so only series that actually occur are exported
+METRIC_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+METRIC_LOCAL_ROUTES = ("/health", "/health/services", "/metrics")
+METRIC_ROUTES = (*SERVICE_ROUTES, *METRIC_LOCAL_ROUTES, "other")
+
+_count_children = {}
+_latency_children = {
+    (method, route): REQUEST_LATENCY.labels(method=method, path=route)
+    for method in METRIC_METHODS
+    for route in METRIC_ROUTES
+}
+_upstream_children = {
+    route: UPSTREAM_LATENCY.labels(service=route.split("/")[-1]) for route in SERVICE_ROUTES
+}
+
+
+def get_route_prefix(path: str) -> Optional[str]:
+    """Get the SERVICE_ROUTES prefix matching a path."""
+    for route_prefix in SERVICE_ROUTES:
+        if path.startswith(route_prefix):
+            return route_prefix
+    return None
+
+
+def metric_route(path: str) -> str:
+    """Map a request path to its bounded metric label."""
+    if path in METRIC_LOCAL_ROUTES:
+        return path
+    return get_route_prefix(path) or "other"
+
+
+def record_request_metrics(method: str, route: str, status: int, duration: float) -> None:
+    """Record request count and latency, binding count children on first use."""
+    key = (method, route, status)
+    counter = _count_children.get(key)
+    if counter is None:
+        counter = _count_children[key] = REQUEST_COUNT.labels(
+            method=method, path=route, status=status
+        )
+    counter.inc()
+
+    histogram = _latency_children.get((method, route))
+    if histogram is None:
+        histogram = REQUEST_LATENCY.labels(method=method, path=route)
+    histogram.observe(duration)
 
 logger = get_logger(__name__)
 
+# (computed_at, payload) of the last /health/services fan-out
+_services_health_cache: Optional[tuple[float, dict]] = None
+_services_health_lock = asyncio.Lock()
+
+# (path, query, authorization) -> future resolving to (status, headers, body) or None
+_inflight: dict[tuple[str, str, str], asyncio.Future] = {}
+
+# token digest -> (expires_at, payload), least recently used first
+_token_cache: "OrderedDict[bytes, tuple[float, TokenPayload]]" = OrderedDict()
+
+
+def verify_token_cached(token: str) -> TokenPayload:
+    """
+    Verify a JWT, reusing the payload of recently verified tokens.
+    Entries live until the token expires or TOKEN_CACHE_TTL elapses, whichever is first.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+
+    entry = _token_cache.get(key)
+    if entry is not None:
+        expires_at, payload = entry
+        if now < expires_at:
+            _token_cache.move_to_end(key)
+            return payload
+        del _token_cache[key]
+
+    payload = verify_token(token)
+    _token_cache[key] = (min(payload.exp.timestamp(), now + TOKEN_CACHE_TTL), payload)
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return payload
+
+
+# rate key -> [tokens, last_refill]
+_local_buckets: dict[str, list[float]] = {}
+# rate key -> hits served locally and not yet pushed to Redis
+_pending_hits: dict[str, int] = {}
+
+
+def consume_local_token(rate_key: str) -> bool:
+    """
+    Take one token from the in-process bucket for rate_key.
+    Runs without awaiting, so the event loop serializes access.
+    """
+    now = time.monotonic()
+    bucket = _local_buckets.get(rate_key)
+    if bucket is None:
+        bucket = _local_buckets[rate_key] = [float(RATE_LIMIT_LOCAL), now]
+    else:
+        refill = (now - bucket[1]) * RATE_LIMIT_LOCAL / RATE_LIMIT_WINDOW
+        bucket[0] = min(float(RATE_LIMIT_LOCAL), bucket[0] + refill)
+        bucket[1] = now
+
+    if bucket[0] < 1:
+        return False
+
+    bucket[0] -= 1
+    _pending_hits[rate_key] = _pending_hits.get(rate_key, 0) + 1
+    return True
+
+
+async def flush_rate_limits() -> None:
+    """Push locally counted hits to Redis and drop idle full buckets."""
+    global _pending_hits
+    if _pending_hits:
+        hits, _pending_hits = _pending_hits, {}
+        try:
+            cache = await get_cache()
+            await cache.rate_limit_add(
+                {f"gateway:{key}": count for key, count in hits.items()},
+                window=RATE_LIMIT_WINDOW,
+            )
+        except Exception as e:
+            logger.error("rate_limit_sync_failed", error=str(e), keys=len(hits))
+            # Keep the hits for the next flush instead of losing them
+            for key, count in hits.items():
+                _pending_hits[key] = _pending_hits.get(key, 0) + count
+
+    now = time.monotonic()
+    idle = [
+        key for key, (tokens, last_refill) in _local_buckets.items()
+        if tokens >= RATE_LIMIT_LOCAL and now - last_refill > RATE_LIMIT_WINDOW
+    ]
+    for key in idle:
+        del _local_buckets[key]
+
+
+async def rate_limit_sync_loop() -> None:
+    """Periodically sync local rate limit counters to Redis."""
+    while True:
+        await asyncio.sleep(RATE_LIMIT_SYNC_INTERVAL)
+        await flush_rate_limits()
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using Redis."""
+    """Rate limiting middleware using local token buckets backed by Redis."""
 
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for health checks
@@ -66,12 +275,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if auth_header.startswith("Bearer "):
             try:
                 token = auth_header.split(" ")[1]
-                payload = verify_token(token)
+                payload = verify_token_cached(token)
                 rate_key = f"user:{payload.sub}"
             except Exception as e:
                 # Token invalid/expired - fall back to IP-based rate limiting
                 logger.debug("token_verification_for_rate_limit_failed", error=str(e), client=client_ip)
 
+        # Serve from the local bucket; only go to Redis once it runs dry
+        if consume_local_token(rate_key):
+            return await call_next(request)
+
         # Check rate limit
         try:
             cache = await get_cache()
@@ -104,45 +317,77 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return response
 
 
+def enqueue_request_log(request: Request, event: dict) -> None:
+    """Queue a request log event for the batch writer, dropping it if the queue is full."""
+    queue = getattr(request.app.state, "log_queue", None)
+    if queue is None:
+        write_request_logs([event])
+        return
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        DROPPED_LOGS.inc()
+
+
+def write_request_logs(events: list[dict]) -> None:
+    """
+    Emit a batch of request log events through the service logger, which
+    applies level filtering and hands the writes to the logging thread.
+    """
+    for event in events:
+        if "duration" in event:
+            event["duration"] = f"{event['duration']:.3f}s"
+        logger.info(event.pop("event"), **event)
+
+
+async def drain_request_logs(queue: asyncio.Queue) -> None:
+    """Emit queued request logs in batches of up to LOG_BATCH_SIZE events."""
+    while True:
+        events = [await queue.get()]
+        while len(events) < LOG_BATCH_SIZE and not queue.empty():
+            events.append(queue.get_nowait())
+        try:
+            write_request_logs(events)
+        except Exception as e:
+            logger.error("request_log_write_failed", error=str(e), events=len(events))
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Request logging middleware."""
+    """Request logging middleware; events are emitted by drain_request_logs."""
 
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        request_id = request.headers.get("X-Request-ID", str(time.time()))
+        start_time = time.perf_counter()
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
 
-        logger.info(
-            "request_started",
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            client=request.client.host if request.client else "unknown",
-        )
+        enqueue_request_log(request, {
+            "event": "request_started",
+            "request_id": request_id,
+            "method": request.method,
+            "path": request.url.path,
+            "client": request.client.host if request.client else "unknown",
+        })
 
         try:
             response = await call_next(request)
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
-            REQUEST_COUNT.labels(
-                method=request.method,
-                path=request.url.path,
-                status=response.status_code,
-            ).inc()
-
-            REQUEST_LATENCY.labels(
-                method=request.method,
-                path=request.url.path,
-            ).observe(duration)
-
-            logger.info(
-                "request_completed",
-                request_id=request_id,
-                status=response.status_code,
-                duration=f"{duration:.3f}s",
+            record_request_metrics(
+                request.method,
+                metric_route(request.url.path),
+                response.status_code,
+                duration,
             )
 
+            enqueue_request_log(request, {
+                "event": "request_completed",
+                "request_id": request_id,
+                "status": response.status_code,
+                "duration": duration,
+            })
+
             response.headers["X-Request-ID"] = request_id
-            response.headers["X-Response-Time"] = f"{duration:.3f}s"
+            if DEBUG_TIMING:
+                response.headers["X-Response-Time"] = f"{duration:.3f}s"
             return response
 
         except Exception as e:
@@ -159,7 +404,21 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     setup_logging(service_name="api-gateway")
     logger.info("api_gateway_starting", version="9.0.0", routes=list(SERVICE_ROUTES.keys()))
+    # HTTP client for proxying, created inside the running event loop
+    app.state.http_client = httpx.AsyncClient(timeout=30.0)
+    app.state.log_queue = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+    log_task = asyncio.create_task(drain_request_logs(app.state.log_queue))
+    sync_task = asyncio.create_task(rate_limit_sync_loop())
     yield
+    sync_task.cancel()
+    log_task.cancel()
+    await flush_rate_limits()
+    pending_logs = []
+    while not app.state.log_queue.empty():
+        pending_logs.append(app.state.log_queue.get_nowait())
+    if pending_logs:
+        write_request_logs(pending_logs)
+    await app.state.http_client.aclose()
     logger.info("api_gateway_stopping")
 
 
@@ -168,13 +427,15 @@ app = FastAPI(
     description="بوابة API لمنصة سهول اليمن",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS Configuration - use specific origins in production
-CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
-CORS_ALLOW_CREDENTIALS = bool(CORS_ORIGINS)  # Only allow credentials with specific origins
+# Add middlewares (CORS last so it wraps the others)
+app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(RateLimitMiddleware)
+CORS_ORIGINS = install_cors(app)
 
-# Startup warning for CORS configuration
+# Startup warning for CORS configuration - use specific origins in production
 if not CORS_ORIGINS:
     logger.warning(
         "cors_not_configured",
@@ -182,125 +443,218 @@ if not CORS_ORIGINS:
                 "Authentication cookies will NOT work. Set CORS_ORIGINS for production."
     )
 
-# Add middlewares
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(RateLimitMiddleware)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS if CORS_ORIGINS else ["*"],
-    allow_credentials=CORS_ALLOW_CREDENTIALS,  # False when using wildcard origins
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# HTTP client for proxying
-http_client = httpx.AsyncClient(timeout=30.0)
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Get the shared upstream HTTP client."""
+    return request.app.state.http_client
+
+
+# Health payload never changes, so it is serialized once at import
+_HEALTH_BYTES = json.dumps(
+    {"status": "healthy", "version": "9.0.0", "service": "api-gateway"}
+).encode()
 
 
-@app.get("/health", response_model=HealthResponse)
+@app.get("/health", include_in_schema=False)
 async def health_check():
     """Gateway health check."""
-    return HealthResponse(
-        status="healthy",
-        version="9.0.0",
-        service="api-gateway"
-    )
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+
+async def probe_service(http_client: httpx.AsyncClient, url: str) -> dict:
+    """Probe a single backend service's /health endpoint."""
+    try:
+        response = await http_client.get(f"{url}/health", timeout=5.0)
+        return {
+            "status": "healthy" if response.status_code == 200 else "unhealthy",
+            "response_time_ms": response.elapsed.total_seconds() * 1000,
+        }
+    except Exception as e:
+        return {
+            "status": "unhealthy",
+            "error": str(e),
+        }
 
 
 @app.get("/health/services")
-async def services_health():
+async def services_health(
+    response: Response,
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+):
     """Check health of all backend services."""
-    results = {}
+    global _services_health_cache
 
-    for path, url in SERVICE_ROUTES.items():
-        service_name = path.split("/")[-1]
-        try:
-            response = await http_client.get(f"{url}/health", timeout=5.0)
-            results[service_name] = {
-                "status": "healthy" if response.status_code == 200 else "unhealthy",
-                "response_time_ms": response.elapsed.total_seconds() * 1000,
-            }
-        except Exception as e:
-            results[service_name] = {
-                "status": "unhealthy",
-                "error": str(e),
-            }
+    response.headers["Cache-Control"] = f"max-age={int(HEALTH_CACHE_TTL)}"
+    cached = _services_health_cache
+    if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+        return cached[1]
+
+    # Callers arriving during a refresh wait for it instead of probing again
+    async with _services_health_lock:
+        cached = _services_health_cache
+        if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+            return cached[1]
 
-    overall = "healthy" if all(s["status"] == "healthy" for s in results.values()) else "degraded"
+        probes = await asyncio.gather(
+            *(probe_service(http_client, url) for url in SERVICE_ROUTES.values())
+        )
+        results = {
+            path.split("/")[-1]: probe
+            for path, probe in zip(SERVICE_ROUTES, probes, strict=True)
+        }
+        overall = "healthy" if all(s["status"] == "healthy" for s in results.values()) else "degraded"
 
-    return {
-        "status": overall,
-        "services": results,
-    }
+        payload = {
+            "status": overall,
+            "services": results,
+        }
+        _services_health_cache = (time.monotonic(), payload)
+        return payload
 
 
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint."""
-    return Response(content=generate_latest(), media_type="text/plain")
+    return Response(content=generate_latest(METRICS_REGISTRY), media_type="text/plain")
+
+
+def filter_response_headers(headers: httpx.Headers) -> list[tuple[bytes, bytes]]:
+    """Drop hop-by-hop headers, keeping repeated headers such as Set-Cookie."""
+    return [(k, v) for k, v in headers.raw if k.lower() not in RESPONSE_SKIP_HEADERS]
+
+
+def is_shareable(headers: httpx.Headers) -> bool:
+    """Whether an upstream response may also be returned to coalesced waiters."""
+    if "set-cookie" in headers:
+        return False
+    cache_control = headers.get("cache-control", "").lower()
+    if "private" in cache_control or "no-store" in cache_control:
+        return False
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    return vary.issubset(SINGLE_FLIGHT_KEY_HEADERS)
+
+
+def finish_flight(key: tuple[str, ...], snapshot: Optional[tuple]) -> None:
+    """Release waiters on an in-flight GET; None tells them to fetch for themselves."""
+    future = _inflight.pop(key, None)
+    if future is not None and not future.done():
+        future.set_result(snapshot)
+
+
+def snapshot_response(snapshot: tuple) -> Response:
+    """Build a response from a buffered (status, headers, body) upstream result."""
+    status_code, headers, content = snapshot
+    response = Response(content=content, status_code=status_code)
+    response.raw_headers.extend(headers)
+    return response
 
 
 def get_upstream_url(path: str) -> Optional[str]:
     """Get upstream service URL for a path."""
-    for route_prefix, service_url in SERVICE_ROUTES.items():
-        if path.startswith(route_prefix):
-            return service_url
-    return None
+    route_prefix = get_route_prefix(path)
+    return SERVICE_ROUTES[route_prefix] if route_prefix else None
 
 
 @app.api_route(
     "/api/{path:path}",
     methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
 )
-async def proxy_request(request: Request, path: str):
+async def proxy_request(
+    request: Request,
+    path: str,
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+):
     """
     Proxy requests to backend services.
     توجيه الطلبات إلى الخدمات الخلفية
     """
     full_path = f"/api/{path}"
-    upstream_url = get_upstream_url(full_path)
+    route_prefix = get_route_prefix(full_path)
 
-    if not upstream_url:
+    if not route_prefix:
         raise HTTPException(
             status_code=404,
             detail=f"لا يوجد خدمة للمسار: {full_path}"
         )
 
     # Build upstream URL
-    target_url = f"{upstream_url}{full_path}"
+    target_url = f"{SERVICE_ROUTES[route_prefix]}{full_path}"
     if request.url.query:
         target_url += f"?{request.url.query}"
 
-    # Forward headers
-    headers = dict(request.headers)
-    headers.pop("host", None)
-    headers["X-Forwarded-For"] = request.client.host if request.client else "unknown"
-    headers["X-Forwarded-Proto"] = request.url.scheme
-
-    # Get request body
-    body = await request.body()
+    # Forward headers as raw pairs (ASGI names are already lower-case)
+    client_ip = request.client.host if request.client else "unknown"
+    headers = [(k, v) for k, v in request.headers.raw if k not in REQUEST_SKIP_HEADERS]
+    headers.append((b"x-forwarded-for", client_ip.encode("latin-1")))
+    headers.append((b"x-forwarded-proto", request.url.scheme.encode("latin-1")))
+
+    # Stream the request body through instead of reading it into memory;
+    # requests without a body must not be sent upstream as chunked
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    body = request.stream() if has_body else None
+
+    # Single-flight: duplicates of an in-flight GET wait for its result
+    flight_key = None
+    if (
+        request.method == "GET"
+        and body is None
+        and not any(h in request.headers for h in SINGLE_FLIGHT_BYPASS_HEADERS)
+    ):
+        flight_key = (
+            full_path,
+            request.url.query,
+            *(request.headers.get(h, "") for h in SINGLE_FLIGHT_KEY_HEADERS),
+        )
+        pending = _inflight.get(flight_key)
+        if pending is not None:
+            snapshot = await asyncio.shield(pending)
+            if snapshot is not None:
+                return snapshot_response(snapshot)
+            flight_key = None
+        elif len(_inflight) < SINGLE_FLIGHT_MAX_KEYS:
+            _inflight[flight_key] = asyncio.get_running_loop().create_future()
+        else:
+            flight_key = None
 
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        response = await http_client.request(
+        upstream_request = http_client.build_request(
             method=request.method,
             url=target_url,
             headers=headers,
             content=body,
         )
-
-        upstream_time = time.time() - start_time
-        service_name = full_path.split("/")[3] if len(full_path.split("/")) > 3 else "unknown"
-        UPSTREAM_LATENCY.labels(service=service_name).observe(upstream_time)
-
-        # Return response
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=dict(response.headers),
-            media_type=response.headers.get("content-type"),
+        upstream = await http_client.send(upstream_request, stream=True)
+
+        upstream_time = time.perf_counter() - start_time
+        _upstream_children[route_prefix].observe(upstream_time)
+
+        if flight_key is not None:
+            # Buffer small shareable bodies so waiters can reuse them; anything
+            # else streams as usual and the waiters fetch for themselves
+            snapshot = None
+            length = upstream.headers.get("content-length", "")
+            if (
+                length.isdigit()
+                and int(length) <= SINGLE_FLIGHT_MAX_BODY
+                and is_shareable(upstream.headers)
+            ):
+                content = b"".join([chunk async for chunk in upstream.aiter_raw()])
+                await upstream.aclose()
+                snapshot = (upstream.status_code, filter_response_headers(upstream.headers), content)
+            finish_flight(flight_key, snapshot)
+            if snapshot is not None:
+                return snapshot_response(snapshot)
+
+        # Stream the raw upstream body; the connection is released once it is sent
+        response = StreamingResponse(
+            upstream.aiter_raw(chunk_size=PROXY_CHUNK_SIZE),
+            status_code=upstream.status_code,
+            background=BackgroundTask(upstream.aclose),
         )
+        response.raw_headers.extend(filter_response_headers(upstream.headers))
+        return response
 
     except httpx.TimeoutException:
         logger.error("upstream_timeout", url=target_url)
@@ -320,14 +674,21 @@ async def proxy_request(request: Request, path: str):
             status_code=502,
             detail="خطأ في الاتصال بالخدمة."
         )
-
-
-@app.on_event("shutdown")
-async def shutdown():
-    """Cleanup on shutdown."""
-    await http_client.aclose()
+    finally:
+        if flight_key is not None:
+            finish_flight(flight_key, None)
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=WORKERS,
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
@@ -5,19 +5,19 @@ Sahool Yemen Platform v9.0.0
 Handles geographic data processing and spatial operations.
 """
 
+import json
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, HTTPException, Query  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
+from fastapi import FastAPI, Response, HTTPException, Query
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
 try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
+    from sahool_shared.utils import setup_logging, get_logger
+    from sahool_shared.cors import install_cors
 except ImportError:
     import logging
 
@@ -27,6 +27,10 @@ except ImportError:
     def get_logger(name: str):
         return logging.getLogger(name)
 
+    def install_cors(app: FastAPI) -> list:
+        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+        return []
+
 logger = get_logger(__name__)
 
 
@@ -87,28 +91,66 @@ app = FastAPI(
     description="خدمة البيانات الجغرافية - Geographic Data Service",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
-CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS if CORS_ORIGINS else ["*"],
-    allow_credentials=bool(CORS_ORIGINS),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+install_cors(app)
+
+
+# ============================================================
+# Stub Responses
+# ============================================================
+
+# Placeholder payloads for endpoints that are not implemented yet,
+# encoded once so each call only copies bytes
+_STUB_BYTES = {
+    "geocode": json.dumps(
+        {"success": True, "results": [], "message": "Geocoding not yet implemented"}
+    ).encode(),
+    "reverse_geocode": json.dumps(
+        {"success": True, "address": None, "message": "Reverse geocoding not yet implemented"}
+    ).encode(),
+    "spatial_query": json.dumps(
+        {"success": True, "results": [], "message": "Spatial query not yet implemented"}
+    ).encode(),
+    "calculate_area": json.dumps(
+        {
+            "success": True,
+            "area_hectares": 0,
+            "area_square_meters": 0,
+            "message": "Area calculation not yet implemented",
+        }
+    ).encode(),
+    "elevation": json.dumps(
+        {
+            "success": True,
+            "elevation_meters": None,
+            "message": "Elevation service not yet implemented",
+        }
+    ).encode(),
+}
+
+
+def stub_response(name: str) -> Response:
+    """Build a JSON response from a pre-encoded stub payload."""
+    return Response(content=_STUB_BYTES[name], media_type="application/json")
 
 
 # ============================================================
 # Health Check
 # ============================================================
 
-@app.get("/health")
+# Health payload never changes, so it is serialized once at import
+_HEALTH_BYTES = json.dumps(
+    {"status": "healthy", "service": "geo-service", "version": "9.0.0"}
+).encode()
+
+
+@app.get("/health", include_in_schema=False)
 async def health_check():
     """Service health check."""
-    return {"status": "healthy", "service": "geo-service", "version": "9.0.0"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 # ============================================================
@@ -123,11 +165,7 @@ async def geocode(address: str = Query(..., description="Address to geocode")):
     """
     logger.info("geocode", address=address)
     # TODO: Implement geocoding
-    return {
-        "success": True,
-        "results": [],
-        "message": "Geocoding not yet implemented"
-    }
+    return stub_response("geocode")
 
 
 @app.post("/api/v1/geo/reverse-geocode")
@@ -138,11 +176,7 @@ async def reverse_geocode(point: GeoPoint):
     """
     logger.info("reverse_geocode", lat=point.lat, lng=point.lng)
     # TODO: Implement reverse geocoding
-    return {
-        "success": True,
-        "address": None,
-        "message": "Reverse geocoding not yet implemented"
-    }
+    return stub_response("reverse_geocode")
 
 
 @app.post("/api/v1/geo/spatial-query")
@@ -153,11 +187,7 @@ async def spatial_query(query: SpatialQuery):
     """
     logger.info("spatial_query", operation=query.operation, layer=query.layer)
     # TODO: Implement spatial query with PostGIS
-    return {
-        "success": True,
-        "results": [],
-        "message": "Spatial query not yet implemented"
-    }
+    return stub_response("spatial_query")
 
 
 @app.get("/api/v1/geo/boundaries/{field_id}")
@@ -179,12 +209,7 @@ async def calculate_area(geometry: GeoPolygon):
     """
     logger.info("calculate_area")
     # TODO: Implement area calculation
-    return {
-        "success": True,
-        "area_hectares": 0,
-        "area_square_meters": 0,
-        "message": "Area calculation not yet implemented"
-    }
+    return stub_response("calculate_area")
 
 
 @app.get("/api/v1/geo/elevation")
@@ -194,13 +219,19 @@ async def get_elevation(lat: float = Query(...), lng: float = Query(...)):
     الحصول على الارتفاع عند نقطة
     """
     logger.info("get_elevation", lat=lat, lng=lng)
-    return {
-        "success": True,
-        "elevation_meters": None,
-        "message": "Elevation service not yet implemented"
-    }
+    return stub_response("elevation")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "2")),
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
@@ -5,19 +5,20 @@ Sahool Yemen Platform v9.0.0
 Handles satellite imagery acquisition and processing.
 """
 
+import json
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
+from fastapi import FastAPI, Response, HTTPException, Query, BackgroundTasks
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
 try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
+    from sahool_shared.utils import setup_logging, get_logger
+    from sahool_shared.cors import install_cors
+    from sahool_shared.cache import cache_response
 except ImportError:
     import logging
 
@@ -27,6 +28,13 @@ except ImportError:
     def get_logger(name: str):
         return logging.getLogger(name)
 
+    def install_cors(app: FastAPI) -> list:
+        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+        return []
+
+    def cache_response(ttl: int = 60, key_fn=None, local_ttl: int = 0, local_maxsize: int = 1024, model=None):
+        return lambda func: func
+
 logger = get_logger(__name__)
 
 
@@ -98,28 +106,51 @@ app = FastAPI(
     description="خدمة الصور الفضائية - Satellite Imagery Service",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
-CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS if CORS_ORIGINS else ["*"],
-    allow_credentials=bool(CORS_ORIGINS),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+install_cors(app)
+
+
+# ============================================================
+# Stub Responses
+# ============================================================
+
+# Placeholder payloads for endpoints that are not implemented yet,
+# encoded once so each call only copies bytes
+_STUB_BYTES = {
+    "download": json.dumps(
+        {"success": True, "job_id": None, "message": "Download queuing not yet implemented"}
+    ).encode(),
+    "process": json.dumps(
+        {"success": True, "job_id": None, "message": "Processing not yet implemented"}
+    ).encode(),
+    "latest": json.dumps(
+        {"success": True, "image": None, "message": "Latest imagery retrieval not yet implemented"}
+    ).encode(),
+}
+
+
+def stub_response(name: str) -> Response:
+    """Build a JSON response from a pre-encoded stub payload."""
+    return Response(content=_STUB_BYTES[name], media_type="application/json")
 
 
 # ============================================================
 # Health Check
 # ============================================================
 
-@app.get("/health")
+# Health payload never changes, so it is serialized once at import
+_HEALTH_BYTES = json.dumps(
+    {"status": "healthy", "service": "imagery-service", "version": "9.0.0"}
+).encode()
+
+
+@app.get("/health", include_in_schema=False)
 async def health_check():
     """Service health check."""
-    return {"status": "healthy", "service": "imagery-service", "version": "9.0.0"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 # ============================================================
@@ -154,11 +185,7 @@ async def download_imagery(
     """
     logger.info("download_imagery", image_id=image_id)
     # TODO: Implement async download with CDSE
-    return {
-        "success": True,
-        "job_id": None,
-        "message": "Download queuing not yet implemented"
-    }
+    return stub_response("download")
 
 
 @app.get("/api/v1/imagery/jobs/{job_id}", response_model=ProcessingJob)
@@ -182,14 +209,11 @@ async def process_imagery(
     إضافة صورة للمعالجة
     """
     logger.info("process_imagery", image_id=image_id, process_type=process_type)
-    return {
-        "success": True,
-        "job_id": None,
-        "message": "Processing not yet implemented"
-    }
+    return stub_response("process")
 
 
 @app.get("/api/v1/imagery/field/{field_id}/latest")
+@cache_response(ttl=300, key_fn=lambda field_id, satellite: f"{field_id}:{satellite}")
 async def get_latest_imagery(
     field_id: str,
     satellite: str = Query(default="sentinel-2"),
@@ -199,13 +223,19 @@ async def get_latest_imagery(
     الحصول على أحدث صورة للحقل
     """
     logger.info("get_latest_imagery", field_id=field_id, satellite=satellite)
-    return {
-        "success": True,
-        "image": None,
-        "message": "Latest imagery retrieval not yet implemented"
-    }
+    return stub_response("latest")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "2")),
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
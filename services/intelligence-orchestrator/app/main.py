@@ -5,19 +5,19 @@ Sahool Yemen Platform v9.0.0
 Orchestrates AI/ML models for agricultural intelligence.
 """
 
+import json
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Dict, Any
 
-sys.path.insert(0, "/app/libs-shared")
-
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
+from fastapi import FastAPI, Response, HTTPException, Query, BackgroundTasks
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
 try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
+    from sahool_shared.utils import setup_logging, get_logger
+    from sahool_shared.cors import install_cors
 except ImportError:
     import logging
 
@@ -27,6 +27,10 @@ except ImportError:
     def get_logger(name: str):
         return logging.getLogger(name)
 
+    def install_cors(app: FastAPI) -> list:
+        app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+        return []
+
 logger = get_logger(__name__)
 
 
@@ -88,28 +92,27 @@ app = FastAPI(
     description="منسق الذكاء الاصطناعي الزراعي - Agricultural AI Orchestrator",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
-CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS if CORS_ORIGINS else ["*"],
-    allow_credentials=bool(CORS_ORIGINS),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+install_cors(app)
 
 
 # ============================================================
 # Health Check
 # ============================================================
 
-@app.get("/health")
+# Health payload never changes, so it is serialized once at import
+_HEALTH_BYTES = json.dumps(
+    {"status": "healthy", "service": "intelligence-orchestrator", "version": "9.0.0"}
+).encode()
+
+
+@app.get("/health", include_in_schema=False)
 async def health_check():
     """Service health check."""
-    return {"status": "healthy", "service": "intelligence-orchestrator", "version": "9.0.0"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 # ============================================================
@@ -199,4 +202,14 @@ async def batch_prediction(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "2")),
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
@@ -6,26 +6,16 @@ Controls and monitors irrigation systems.
 """
 
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict
 
-sys.path.insert(0, "/app/libs-shared")
+from fastapi import FastAPI, Query
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
-from fastapi import FastAPI, Query  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
-
-try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
-except ImportError:
-    import logging
-
-    def setup_logging(service_name: str):
-        pass
-
-    def get_logger(name: str):
-        return logging.getLogger(name)
+from sahool_shared.utils import setup_logging, get_logger
 
 logger = get_logger(__name__)
 
@@ -92,8 +82,11 @@ app = FastAPI(
     description="متحكم الري الذكي - Smart Irrigation Controller",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS Configuration
 CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 
@@ -126,7 +119,7 @@ async def list_zones(field_id: Optional[str] = Query(None)):
     List irrigation zones.
     عرض مناطق الري
     """
-    logger.info("list_zones", field_id=field_id)
+    logger.debug("list_zones", field_id=field_id)
     return {"success": True, "zones": []}
 
 
@@ -146,7 +139,7 @@ async def list_schedules(zone_id: Optional[str] = Query(None)):
     List irrigation schedules.
     عرض جداول الري
     """
-    logger.info("list_schedules", zone_id=zone_id)
+    logger.debug("list_schedules", zone_id=zone_id)
     return {"success": True, "schedules": []}
 
 
@@ -189,7 +182,7 @@ async def get_system_status():
     Get irrigation system status.
     الحصول على حالة نظام الري
     """
-    logger.info("get_system_status")
+    logger.debug("get_system_status")
     return {
         "success": True,
         "status": "offline",
@@ -207,7 +200,7 @@ async def get_usage_report(
     Get water usage report.
     الحصول على تقرير استخدام المياه
     """
-    logger.info("get_usage_report", start=start_date, end=end_date)
+    logger.debug("get_usage_report", start=start_date, end=end_date)
     return {
         "success": True,
         "report": None,
@@ -6,29 +6,27 @@ Advanced NDVI processing and vegetation analysis.
 """
 
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict, Any
+from uuid import UUID
 
-sys.path.insert(0, "/app/libs-shared")
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
-
-try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
-except ImportError:
-    import logging
-
-    def setup_logging(service_name: str):
-        pass
-
-    def get_logger(name: str):
-        return logging.getLogger(name)
+from sahool_shared.auth import get_current_user, AuthenticatedUser
+from sahool_shared.models import Field as FieldRecord, NDVIResult as NDVIRecord
+from sahool_shared.utils import get_db, setup_logging, get_logger
 
 logger = get_logger(__name__)
 
+# Field IDs per aggregate query, keeping bind parameters well under the Postgres limit
+BATCH_CHUNK_SIZE = 500
+
 
 # ============================================================
 # Models
@@ -94,8 +92,11 @@ app = FastAPI(
     description="محرك مؤشر الغطاء النباتي - Vegetation Index Engine",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS Configuration
 CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 
@@ -121,6 +122,10 @@ async def health_check():
 # ============================================================
 # NDVI Endpoints
 # ============================================================
+#
+# Handlers stay `async def` for I/O (database, Redis, HTTP). Raster math
+# (NumPy/rasterio) must not run on the event loop: call it through
+# `await asyncio.to_thread(...)`, or hand large jobs to a background worker.
 
 @app.post("/api/v1/ndvi/calculate", response_model=NDVIResult)
 async def calculate_ndvi(request: NDVIRequest):
@@ -148,7 +153,7 @@ async def get_latest_ndvi(field_id: str):
     Get latest NDVI for a field.
     الحصول على أحدث قراءة NDVI
     """
-    logger.info("get_latest_ndvi", field_id=field_id)
+    logger.debug("get_latest_ndvi", field_id=field_id)
     raise HTTPException(status_code=404, detail="No NDVI data found for field")
 
 
@@ -162,7 +167,7 @@ async def get_ndvi_timeseries(
     Get NDVI time series for a field.
     الحصول على السلسلة الزمنية لـ NDVI
     """
-    logger.info("get_ndvi_timeseries", field_id=field_id, start=start_date, end=end_date)
+    logger.debug("get_ndvi_timeseries", field_id=field_id, start=start_date, end=end_date)
     return NDVITimeSeries(
         field_id=field_id,
         data_points=[],
@@ -176,7 +181,7 @@ async def get_health_zones(field_id: str):
     Get health zones within a field.
     الحصول على مناطق الصحة داخل الحقل
     """
-    logger.info("get_health_zones", field_id=field_id)
+    logger.debug("get_health_zones", field_id=field_id)
     return {
         "success": True,
         "field_id": field_id,
@@ -188,20 +193,64 @@ async def get_health_zones(field_id: str):
 @app.post("/api/v1/ndvi/batch-process")
 async def batch_process_ndvi(
     field_ids: List[str] = Query(...),
-    background_tasks: BackgroundTasks = None,
+    db: AsyncSession = Depends(get_db),
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Batch process NDVI for multiple fields.
     معالجة NDVI لعدة حقول
     """
     logger.info("batch_process_ndvi", count=len(field_ids))
+    try:
+        ids = list(dict.fromkeys(UUID(field_id) for field_id in field_ids))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid field ID") from None
+
+    # Fields of other tenants are reported as missing
+    results = await fetch_ndvi_aggregates(db, ids, user.tenant_uuid)
     return {
         "success": True,
-        "job_id": None,
-        "message": "Batch processing not yet implemented"
+        "results": results,
+        "missing": [str(field_id) for field_id in ids if str(field_id) not in results],
     }
 
 
+async def fetch_ndvi_aggregates(
+    db: AsyncSession,
+    field_ids: List[UUID],
+    tenant_id: UUID,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate stored NDVI results for the tenant's fields with one grouped query per chunk.
+    Chunks run one after another because a session cannot run statements concurrently.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(field_ids), BATCH_CHUNK_SIZE):
+        chunk = field_ids[start:start + BATCH_CHUNK_SIZE]
+        rows = await db.execute(
+            select(
+                NDVIRecord.field_id,
+                func.avg(NDVIRecord.ndvi_value),
+                func.min(NDVIRecord.ndvi_value),
+                func.max(NDVIRecord.ndvi_value),
+                func.max(NDVIRecord.acquisition_date),
+                func.count(),
+            )
+            .join(FieldRecord, FieldRecord.id == NDVIRecord.field_id)
+            .where(and_(FieldRecord.id.in_(chunk), FieldRecord.tenant_id == tenant_id))
+            .group_by(NDVIRecord.field_id)
+        )
+        for field_id, mean, low, high, latest, count in rows:
+            results[str(field_id)] = {
+                "mean_ndvi": round(float(mean), 3),
+                "min_ndvi": float(low),
+                "max_ndvi": float(high),
+                "latest_date": latest.isoformat(),
+                "count": count,
+            }
+    return results
+
+
 @app.get("/api/v1/ndvi/indices/{field_id}")
 async def get_vegetation_indices(
     field_id: str,
@@ -211,7 +260,7 @@ async def get_vegetation_indices(
     Get multiple vegetation indices.
     الحصول على مؤشرات نباتية متعددة
     """
-    logger.info("get_vegetation_indices", field_id=field_id, indices=indices)
+    logger.debug("get_vegetation_indices", field_id=field_id, indices=indices)
     return {
         "success": True,
         "field_id": field_id,
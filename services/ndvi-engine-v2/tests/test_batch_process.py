@@ -0,0 +1,65 @@
+"""
+Unit tests for NDVI Engine batch processing
+سهول اليمن - اختبارات المعالجة الدفعية لمحرك NDVI
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from app.main import batch_process_ndvi
+from sahool_shared.auth.dependencies import AuthenticatedUser
+from sahool_shared.auth.jwt import TokenPayload
+
+
+class FakeSession:
+    """
+    Stand-in for AsyncSession holding NDVI aggregates per (field, tenant).
+    Returns rows for fields whose ID and tenant are both bound in the query.
+    """
+
+    def __init__(self, aggregates):
+        self.aggregates = aggregates
+
+    async def execute(self, statement):
+        params = statement.compile().params.values()
+        field_ids = {v for value in params if isinstance(value, list) for v in value}
+        tenant_ids = {value for value in params if not isinstance(value, list)}
+        return [
+            (field_id, *row)
+            for (field_id, tenant_id), row in self.aggregates.items()
+            if field_id in field_ids and tenant_id in tenant_ids
+        ]
+
+
+def make_user(tenant_id):
+    return AuthenticatedUser(TokenPayload(
+        sub=str(uuid4()),
+        tenant_id=str(tenant_id),
+        role="viewer",
+        exp=datetime.utcnow() + timedelta(hours=1),
+        iat=datetime.utcnow(),
+        jti="unique-token-id",
+    ))
+
+
+class TestBatchProcessEndpoint:
+    """Test batch NDVI aggregation"""
+
+    def test_other_tenant_field_is_missing(self):
+        """Fields owned by another tenant should be reported as missing"""
+        own_tenant, other_tenant = uuid4(), uuid4()
+        own_field, other_field = uuid4(), uuid4()
+        db = FakeSession({
+            (own_field, own_tenant): (0.55, 0.4, 0.7, date(2024, 5, 1), 3),
+            (other_field, other_tenant): (0.61, 0.5, 0.8, date(2024, 5, 2), 4),
+        })
+
+        result = asyncio.run(batch_process_ndvi(
+            field_ids=[str(own_field), str(other_field)],
+            db=db,
+            user=make_user(own_tenant),
+        ))
+
+        assert list(result["results"]) == [str(own_field)]
+        assert result["results"][str(own_field)]["count"] == 3
+        assert result["missing"] == [str(other_field)]
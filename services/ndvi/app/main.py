@@ -5,29 +5,33 @@ Sahool Yemen v9.0.0
 This service provides NDVI analysis for agricultural fields.
 """
 
-import sys
-sys.path.insert(0, "/app/libs-shared")
-
-from contextlib import asynccontextmanager  # noqa: E402
-from datetime import date, timedelta  # noqa: E402
-from typing import Optional  # noqa: E402
-from uuid import UUID  # noqa: E402
-
-from fastapi import FastAPI, Depends, HTTPException, Query  # noqa: E402
-from fastapi.responses import Response  # noqa: E402
-from prometheus_client import Counter, Histogram, generate_latest  # noqa: E402
-from sqlalchemy import select, and_, func  # noqa: E402
-from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
-
-from sahool_shared.models import NDVIResult, Field  # noqa: E402
-from sahool_shared.schemas.ndvi import (  # noqa: E402
+import hashlib
+from bisect import bisect_right
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from functools import wraps
+from types import MappingProxyType
+from typing import Optional
+from uuid import UUID, uuid4
+
+import numpy as np
+import orjson
+from fastapi import BackgroundTasks, FastAPI, Depends, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import Counter, Histogram, generate_latest
+from sqlalchemy import bindparam, select, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sahool_shared.models import NDVIResult, Field
+from sahool_shared.schemas.ndvi import (
     NDVIResponse, NDVITimeline, NDVITimelinePoint, YieldPrediction
 )
-from sahool_shared.schemas.common import HealthResponse, ErrorResponse  # noqa: E402
-from sahool_shared.auth import get_current_user, AuthenticatedUser  # noqa: E402
-from sahool_shared.utils import get_db, setup_logging, get_logger  # noqa: E402
-from sahool_shared.cache import cached  # noqa: E402
-from sahool_shared.events import publish_event, NDVIProcessedEvent  # noqa: E402
+from sahool_shared.schemas.common import HealthResponse, ErrorResponse
+from sahool_shared.auth import get_current_user, AuthenticatedUser
+from sahool_shared.utils import get_db, setup_logging, get_logger
+from sahool_shared.cache import cached
+from sahool_shared.events import close_event_bus, get_event_bus, publish_event, NDVIProcessedEvent
 
 # Metrics
 REQUEST_COUNT = Counter("ndvi_requests_total", "Total requests", ["method", "endpoint", "status"])
@@ -35,13 +39,98 @@ REQUEST_LATENCY = Histogram("ndvi_request_latency_seconds", "Request latency", [
 
 logger = get_logger(__name__)
 
+# Shared generator for mock data, created once instead of per request
+_RNG = np.random.default_rng()
+
+# Lower bounds of each NDVI health category, ascending; values below 0 are "bare"
+_HEALTH_THRESHOLDS = (0.0, 0.2, 0.4, 0.6)
+_HEALTH_LABELS = ("bare", "poor", "moderate", "good", "excellent")
+
+# Yield estimation parameters per crop type (kg/ha base and NDVI factor)
+_CROP_YIELDS = MappingProxyType({
+    "wheat": MappingProxyType({"base": 3000, "factor": 1.5}),
+    "barley": MappingProxyType({"base": 2500, "factor": 1.4}),
+    "corn": MappingProxyType({"base": 4000, "factor": 1.6}),
+    "coffee": MappingProxyType({"base": 800, "factor": 1.8}),
+    "qat": MappingProxyType({"base": 1500, "factor": 1.3}),
+    "default": MappingProxyType({"base": 2000, "factor": 1.4}),
+})
+
+# Yield recommendations by average NDVI band
+_RECOMMENDATIONS_LOW = (
+    "يُنصح بزيادة الري والتسميد",
+    "فحص التربة للتأكد من توفر العناصر الغذائية",
+)
+_RECOMMENDATIONS_MEDIUM = ("المحصول في حالة متوسطة، يمكن تحسينه بالتسميد الورقي",)
+_RECOMMENDATIONS_HIGH = ("المحصول في حالة جيدة، استمر في الرعاية الحالية",)
+
+
+# Tenant-scoped field lookup, built once and reused with per-request parameters
+_FIELD_ACCESS_STMT = select(Field).where(
+    and_(Field.id == bindparam("field_id"), Field.tenant_id == bindparam("tenant_id"))
+)
+
+# Endpoint arguments that are per-request objects rather than query params
+_UNCACHED_ARGS = frozenset({"db", "background_tasks", "request", "response"})
+
+# Clients may reuse a timeline or latest NDVI for this long before revalidating
+_NDVI_CACHE_CONTROL = "private, max-age=300"
+
+
+def _ndvi_cache_key(prefix: str):
+    """Build cache keys from field, tenant and query params, leaving out per-request objects."""
+    def key_builder(field_id, user, **params) -> str:
+        suffix = ":".join(
+            str(value) for name, value in params.items() if name not in _UNCACHED_ARGS
+        )
+        return f"{prefix}:{field_id}:{user.tenant_id}:{suffix}"
+    return key_builder
+
+
+def _ndvi_etag(result) -> str:
+    """
+    Build an ETag by hashing the response as it is stored in the cache, so a
+    tag always describes the body served alongside it.
+    """
+    data = result.model_dump(mode="json") if hasattr(result, "model_dump") else result
+    encoded = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return f'"{hashlib.blake2b(encoded, digest_size=8).hexdigest()}"'
+
+
+def _conditional_ndvi(func):
+    """
+    Answer with 304 Not Modified when If-None-Match matches the ETag of the
+    (usually cached) response body.
+    """
+    @wraps(func)
+    async def wrapper(field_id, request, response, db, user, **kwargs):
+        result = await func(
+            field_id=field_id, request=request, response=response, db=db, user=user, **kwargs
+        )
+
+        etag = _ndvi_etag(result)
+        headers = {"ETag": etag, "Cache-Control": _NDVI_CACHE_CONTROL}
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return result
+    return wrapper
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     setup_logging(service_name="ndvi-service")
     logger.info("ndvi_service_starting", version="9.0.0")
+    # Connect the event bus up front so publishing never pays connection setup;
+    # if Redis is down, start anyway and let the first publish connect
+    try:
+        await get_event_bus()
+    except Exception as e:
+        logger.warning("event_bus_connect_failed", error=str(e))
     yield
+    await close_event_bus()
     logger.info("ndvi_service_stopping")
 
 
@@ -50,8 +139,12 @@ app = FastAPI(
     description="خدمة تحليل NDVI لمنصة سهول اليمن",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Compress large JSON bodies such as NDVI timelines
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -74,8 +167,13 @@ async def metrics():
     response_model=NDVIResponse,
     responses={404: {"model": ErrorResponse}},
 )
+@_conditional_ndvi
+@cached(ttl=1800, key_builder=_ndvi_cache_key("ndvi:latest"))
 async def get_latest_ndvi(
     field_id: UUID,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
@@ -85,9 +183,7 @@ async def get_latest_ndvi(
     """
     # Verify field access
     field_result = await db.execute(
-        select(Field).where(
-            and_(Field.id == field_id, Field.tenant_id == UUID(user.tenant_id))
-        )
+        _FIELD_ACCESS_STMT, {"field_id": field_id, "tenant_id": user.tenant_uuid}
     )
     field = field_result.scalar_one_or_none()
 
@@ -105,9 +201,10 @@ async def get_latest_ndvi(
 
     if not ndvi:
         # Generate mock NDVI if none exists
-        return await _generate_mock_ndvi(field_id, str(user.tenant_id))
+        return await _generate_mock_ndvi(field_id, str(user.tenant_id), background_tasks)
 
-    return NDVIResponse(
+    # Values come straight from typed DB columns, so validation is skipped
+    return NDVIResponse.model_construct(
         id=ndvi.id,
         field_id=ndvi.field_id,
         tenant_id=ndvi.tenant_id,
@@ -125,9 +222,12 @@ async def get_latest_ndvi(
     "/api/v1/ndvi/fields/{field_id}/timeline",
     response_model=NDVITimeline,
 )
-@cached(ttl=3600, prefix="ndvi:timeline")
+@_conditional_ndvi
+@cached(ttl=3600, key_builder=_ndvi_cache_key("ndvi:timeline"))
 async def get_ndvi_timeline(
     field_id: UUID,
+    request: Request,
+    response: Response,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     db: AsyncSession = Depends(get_db),
@@ -150,53 +250,69 @@ async def get_ndvi_timeline(
             detail="تاريخ البداية يجب أن يكون قبل تاريخ النهاية"
         )
 
-    # Verify field access
-    field_result = await db.execute(
-        select(Field).where(
-            and_(Field.id == field_id, Field.tenant_id == UUID(user.tenant_id))
+    # Stream the NDVI timeline joined to the tenant's field, which also verifies
+    # access; only the needed columns are fetched and the average is computed
+    # by Postgres in the same scan
+    ndvi_result = await db.stream(
+        select(
+            NDVIResult.acquisition_date,
+            NDVIResult.ndvi_value,
+            NDVIResult.cloud_coverage,
+            Field.name_ar,
+            func.avg(NDVIResult.ndvi_value).over().label("average_ndvi"),
         )
-    )
-    field = field_result.scalar_one_or_none()
-
-    if not field:
-        raise HTTPException(status_code=404, detail="الحقل غير موجود")
-
-    # Get NDVI timeline
-    ndvi_result = await db.execute(
-        select(NDVIResult)
+        .join(Field, Field.id == NDVIResult.field_id)
         .where(
             and_(
-                NDVIResult.field_id == field_id,
+                Field.id == field_id,
+                Field.tenant_id == user.tenant_uuid,
                 NDVIResult.acquisition_date >= start_date,
                 NDVIResult.acquisition_date <= end_date,
             )
         )
         .order_by(NDVIResult.acquisition_date.asc())
+        .execution_options(yield_per=500)
     )
-    ndvi_records = ndvi_result.scalars().all()
 
-    if not ndvi_records:
+    # Points are built from typed DB columns, so validation is skipped
+    timeline = []
+    ndvi_values = []
+    first_row = None
+    async for row in ndvi_result:
+        if first_row is None:
+            first_row = row
+        acquisition_date, ndvi_value, cloud_coverage = row[:3]
+        value = float(ndvi_value)
+        ndvi_values.append(value)
+        timeline.append(
+            NDVITimelinePoint.model_construct(
+                date=acquisition_date,
+                ndvi_value=value,
+                health_category=_get_health_category(value),
+                cloud_coverage=float(cloud_coverage) if cloud_coverage else None,
+            )
+        )
+
+    if not timeline:
+        # No data or no access: only this path needs a separate field lookup
+        field_result = await db.execute(
+            _FIELD_ACCESS_STMT, {"field_id": field_id, "tenant_id": user.tenant_uuid}
+        )
+        field = field_result.scalar_one_or_none()
+
+        if not field:
+            raise HTTPException(status_code=404, detail="الحقل غير موجود")
+
         # Generate mock timeline
         return await _generate_mock_timeline(field_id, field.name_ar, str(user.tenant_id), start_date, end_date)
 
-    # Calculate statistics
-    ndvi_values = [float(r.ndvi_value) for r in ndvi_records]
-    average_ndvi = sum(ndvi_values) / len(ndvi_values) if ndvi_values else None
-
-    timeline = [
-        NDVITimelinePoint(
-            date=r.acquisition_date,
-            ndvi_value=float(r.ndvi_value),
-            health_category=_get_health_category(float(r.ndvi_value)),
-            cloud_coverage=float(r.cloud_coverage) if r.cloud_coverage else None,
-        )
-        for r in ndvi_records
-    ]
+    # The field name and windowed average are the same on every row
+    average_ndvi = float(first_row.average_ndvi)
 
     return NDVITimeline(
         field_id=field_id,
-        field_name=field.name_ar,
-        tenant_id=UUID(user.tenant_id),
+        field_name=first_row.name_ar,
+        tenant_id=user.tenant_uuid,
         timeline=timeline,
         start_date=start_date,
         end_date=end_date,
@@ -209,6 +325,7 @@ async def get_ndvi_timeline(
     "/api/v1/ndvi/fields/{field_id}/yield-prediction",
     response_model=YieldPrediction,
 )
+@cached(ttl=3600, key_builder=_ndvi_cache_key("ndvi:yield"))
 async def predict_yield(
     field_id: UUID,
     db: AsyncSession = Depends(get_db),
@@ -218,59 +335,48 @@ async def predict_yield(
     Predict yield based on NDVI data.
     التنبؤ بالمحصول بناءً على بيانات NDVI
     """
-    # Verify field access
-    field_result = await db.execute(
-        select(Field).where(
-            and_(Field.id == field_id, Field.tenant_id == UUID(user.tenant_id))
-        )
-    )
-    field = field_result.scalar_one_or_none()
-
-    if not field:
-        raise HTTPException(status_code=404, detail="الحقل غير موجود")
-
-    # Get average NDVI from last 30 days
+    # Fetch the field (verifying access) and its average NDVI from the last 30 days together
     thirty_days_ago = date.today() - timedelta(days=30)
-    ndvi_result = await db.execute(
+    avg_ndvi_30d = (
         select(func.avg(NDVIResult.ndvi_value))
         .where(
             and_(
-                NDVIResult.field_id == field_id,
+                NDVIResult.field_id == Field.id,
                 NDVIResult.acquisition_date >= thirty_days_ago,
             )
         )
+        .scalar_subquery()
+    )
+    field_result = await db.execute(
+        select(Field, avg_ndvi_30d).where(
+            and_(Field.id == field_id, Field.tenant_id == user.tenant_uuid)
+        )
     )
-    avg_ndvi = ndvi_result.scalar()
+    row = field_result.one_or_none()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="الحقل غير موجود")
+
+    field, avg_ndvi = row
 
     if avg_ndvi is None:
         avg_ndvi = 0.5  # Default
 
     # Yield estimation based on crop type and NDVI
-    crop_yields = {
-        "wheat": {"base": 3000, "factor": 1.5},
-        "barley": {"base": 2500, "factor": 1.4},
-        "corn": {"base": 4000, "factor": 1.6},
-        "coffee": {"base": 800, "factor": 1.8},
-        "qat": {"base": 1500, "factor": 1.3},
-        "default": {"base": 2000, "factor": 1.4},
-    }
-
-    crop_config = crop_yields.get(
+    crop_config = _CROP_YIELDS.get(
         (field.crop_type or "").lower(),
-        crop_yields["default"]
+        _CROP_YIELDS["default"]
     )
 
     predicted_yield = crop_config["base"] * (float(avg_ndvi) * crop_config["factor"])
     confidence = min(85, 50 + float(avg_ndvi) * 50)  # Higher NDVI = higher confidence
 
-    recommendations = []
     if float(avg_ndvi) < 0.3:
-        recommendations.append("يُنصح بزيادة الري والتسميد")
-        recommendations.append("فحص التربة للتأكد من توفر العناصر الغذائية")
+        recommendations = list(_RECOMMENDATIONS_LOW)
     elif float(avg_ndvi) < 0.5:
-        recommendations.append("المحصول في حالة متوسطة، يمكن تحسينه بالتسميد الورقي")
+        recommendations = list(_RECOMMENDATIONS_MEDIUM)
     else:
-        recommendations.append("المحصول في حالة جيدة، استمر في الرعاية الحالية")
+        recommendations = list(_RECOMMENDATIONS_HIGH)
 
     return YieldPrediction(
         field_id=field_id,
@@ -289,42 +395,36 @@ async def predict_yield(
 
 def _get_health_category(ndvi: float) -> str:
     """Get health category from NDVI value."""
-    if ndvi >= 0.6:
-        return "excellent"
-    if ndvi >= 0.4:
-        return "good"
-    if ndvi >= 0.2:
-        return "moderate"
-    if ndvi >= 0:
-        return "poor"
-    return "bare"
+    return _HEALTH_LABELS[bisect_right(_HEALTH_THRESHOLDS, ndvi)]
 
 
-async def _generate_mock_ndvi(field_id: UUID, tenant_id: str) -> NDVIResponse:
-    """Generate mock NDVI result."""
-    import random
-    import uuid
-
-    ndvi_value = round(random.uniform(0.3, 0.8), 3)
+async def _generate_mock_ndvi(
+    field_id: UUID,
+    tenant_id: str,
+    background_tasks: BackgroundTasks,
+) -> NDVIResponse:
+    """Generate mock NDVI result; the event is published after the response is sent."""
+    ndvi_value = round(float(_RNG.uniform(0.3, 0.8)), 3)
 
     # Publish event
-    await publish_event(
+    background_tasks.add_task(
+        publish_event,
         NDVIProcessedEvent.create(
             field_id=str(field_id),
             tenant_id=tenant_id,
             ndvi_value=ndvi_value,
             acquisition_date=date.today(),
-        )
+        ),
     )
 
     return NDVIResponse(
-        id=uuid.uuid4(),
+        id=uuid4(),
         field_id=field_id,
         tenant_id=UUID(tenant_id),
         ndvi_value=ndvi_value,
         acquisition_date=date.today(),
         satellite_name="Sentinel-2 (Demo)",
-        cloud_coverage=round(random.uniform(0, 15), 1),
+        cloud_coverage=round(float(_RNG.uniform(0, 15)), 1),
         created_at=date.today(),
     )
 
@@ -337,32 +437,33 @@ async def _generate_mock_timeline(
     end_date: date,
 ) -> NDVITimeline:
     """Generate mock NDVI timeline."""
-    import random
+    # Points are 5-10 days apart, so this many draws always covers the range
+    n = (end_date - start_date).days // 5 + 1
+    offsets = np.concatenate(([0], np.cumsum(_RNG.integers(5, 11, n - 1))))
+    n = int(np.searchsorted(offsets, (end_date - start_date).days, side="right"))
+    offsets = offsets[:n]
 
-    timeline = []
-    current_date = start_date
-    base_ndvi = random.uniform(0.4, 0.6)
-
-    while current_date <= end_date:
-        # Add some variation
-        ndvi_value = round(base_ndvi + random.uniform(-0.1, 0.1), 3)
-        ndvi_value = max(0, min(1, ndvi_value))  # Clamp to [0, 1]
-
-        timeline.append(NDVITimelinePoint(
-            date=current_date,
-            ndvi_value=ndvi_value,
-            health_category=_get_health_category(ndvi_value),
-            cloud_coverage=round(random.uniform(0, 20), 1),
-        ))
-
-        # Simulate seasonal trend
-        base_ndvi += random.uniform(-0.02, 0.03)
-        base_ndvi = max(0.2, min(0.8, base_ndvi))
+    # Simulate seasonal trend around a slowly drifting base value
+    drift = np.concatenate(([0.0], np.cumsum(_RNG.uniform(-0.02, 0.03, n - 1))))
+    base_ndvi = np.clip(_RNG.uniform(0.4, 0.6) + drift, 0.2, 0.8)
+    ndvi = np.clip(np.round(base_ndvi + _RNG.uniform(-0.1, 0.1, n), 3), 0, 1)
+    clouds = np.round(_RNG.uniform(0, 20, n), 1)
 
-        current_date += timedelta(days=random.randint(5, 10))
+    categories = np.searchsorted(_HEALTH_THRESHOLDS, ndvi, side="right")
 
-    ndvi_values = [p.ndvi_value for p in timeline]
-    average_ndvi = sum(ndvi_values) / len(ndvi_values) if ndvi_values else None
+    ndvi_values = ndvi.tolist()
+    timeline = [
+        NDVITimelinePoint.model_construct(
+            date=start_date + timedelta(days=offset),
+            ndvi_value=value,
+            health_category=_HEALTH_LABELS[category],
+            cloud_coverage=cloud,
+        )
+        for offset, value, category, cloud in zip(
+            offsets.tolist(), ndvi_values, categories.tolist(), clouds.tolist(), strict=True
+        )
+    ]
+    average_ndvi = float(ndvi.mean())
 
     return NDVITimeline(
         field_id=field_id,
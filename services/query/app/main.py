@@ -3,31 +3,50 @@ Sahool Yemen - Query Service (خدمة الاستعلامات)
 Natural language query interface for agricultural data.
 """
 
+import logging
 import os
 import re
-from datetime import datetime
+import sys
+import textwrap
+import time
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from statistics import fmean
+from typing import Any, Dict, List, Optional, Sequence
 
+import orjson
 from fastapi import FastAPI, HTTPException, Query as QueryParam
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from prometheus_client import Counter, Histogram, generate_latest
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
 from starlette.responses import Response
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 # =============================================================================
 # Configuration
 # =============================================================================
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Sahool Query Service",
     description="خدمة الاستعلامات - واجهة استعلام باللغة الطبيعية",
     version="9.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS Configuration - use specific origins in production
 CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 CORS_ALLOW_CREDENTIALS = bool(CORS_ORIGINS)  # Only allow credentials with specific origins
@@ -44,6 +63,10 @@ app.add_middleware(
 REQUEST_COUNT = Counter('sahool_query_requests_total', 'Total query requests', ['query_type', 'status'])
 REQUEST_LATENCY = Histogram('sahool_query_request_duration_seconds', 'Request latency', ['endpoint'])
 QUERY_PARSED = Counter('sahool_query_parsed_total', 'Queries parsed', ['language', 'intent'])
+PARSE_CACHE = Gauge('sahool_query_parse_cache', 'Parse cache lookups since start', ['cache', 'result'])
+
+# Upper bound on queries accepted by the batch endpoint
+MAX_BATCH_QUERIES = 50
 
 # =============================================================================
 # Models
@@ -93,6 +116,25 @@ class NaturalQuery(BaseModel):
     limit: int = Field(10, ge=1, le=100)
 
 
+class BatchQuery(BaseModel):
+    queries: List[NaturalQuery] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+# Metric children for the fixed label sets used by the query handler
+_LAT_QUERY = REQUEST_LATENCY.labels(endpoint="query")
+_LAT_BATCH = REQUEST_LATENCY.labels(endpoint="batch")
+_REQ_ERROR = REQUEST_COUNT.labels(query_type="error", status="error")
+_REQ_SUCCESS_BY_INTENT = {
+    intent: REQUEST_COUNT.labels(query_type=intent.value, status="success")
+    for intent in QueryIntent
+}
+_QUERY_PARSED_BY_LANG_INTENT = {
+    (language, intent): QUERY_PARSED.labels(language=language.value, intent=intent.value)
+    for language in QueryLanguage
+    for intent in QueryIntent
+}
+
+
 # =============================================================================
 # Arabic/English Query Patterns
 # =============================================================================
@@ -176,15 +218,79 @@ ENTITY_PATTERNS = {
     "number": r"(\d+(?:\.\d+)?)",
 }
 
+# Patterns compiled once at import, kept in priority order as (pattern, intent) pairs.
+# Intent patterns are all lowercase and run against the lowercased query, so they
+# skip re.IGNORECASE, which makes matching several times slower.
+_ARABIC_INTENTS = tuple(
+    (re.compile(pattern), intent) for pattern, intent in ARABIC_PATTERNS.items()
+)
+_ENGLISH_INTENTS = tuple(
+    (re.compile(pattern), intent) for pattern, intent in ENGLISH_PATTERNS.items()
+)
+
+
+def _compile_intent_database(patterns: Dict[str, QueryIntent]):
+    """
+    Compile intent patterns into a Hyperscan database that scans for all of them
+    in a single pass. Pattern ids follow dict order, so the lowest matching id is
+    the intent the sequential loop would pick. Returns None when Hyperscan is not
+    installed or rejects a pattern, leaving parse_intent on the compiled `re` loop.
+    """
+    if hyperscan is None:
+        return None
+
+    flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern.encode() for pattern in patterns],
+            ids=list(range(len(patterns))),
+            flags=[flags] * len(patterns),
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+def _on_intent_match(pattern_id, start, end, flags, matched):
+    """Hyperscan match callback collecting matched pattern ids."""
+    matched.append(pattern_id)
+
+
+# Scanned from the event loop thread only, so each database's scratch space is never shared
+_ARABIC_INTENT_DB = _compile_intent_database(ARABIC_PATTERNS)
+_ENGLISH_INTENT_DB = _compile_intent_database(ENGLISH_PATTERNS)
+
+_ENTITY_PATTERNS = tuple(
+    (name, re.compile(pattern, re.IGNORECASE)) for name, pattern in ENTITY_PATTERNS.items()
+)
+
+# Distinct queries remembered by the intent and entity parse caches
+PARSE_CACHE_SIZE = 4096
+
+# Characters inspected by detect_language; the Arabic ratio settles well before this
+LANGUAGE_SAMPLE_CHARS = 128
+
 # =============================================================================
 # Query Parser
 # =============================================================================
 
 
 def detect_language(text: str) -> QueryLanguage:
-    """Detect if text is Arabic or English."""
-    arabic_chars = len(re.findall(r'[\u0600-\u06FF]', text))
-    total_chars = len(re.findall(r'\w', text))
+    """
+    Detect if text is Arabic or English.
+
+    Heuristic: only the first LANGUAGE_SAMPLE_CHARS characters are inspected,
+    which is enough for the 0.3 Arabic ratio threshold on real queries.
+    """
+    # Single pass without building match lists; word characters are
+    # counted the same way as the regex \w (alphanumeric or underscore)
+    arabic_chars = total_chars = 0
+    for ch in text[:LANGUAGE_SAMPLE_CHARS]:
+        if "\u0600" <= ch <= "\u06ff":
+            arabic_chars += 1
+        if ch.isalnum() or ch == "_":
+            total_chars += 1
 
     if total_chars == 0:
         return QueryLanguage.ENGLISH
@@ -195,11 +301,26 @@ def detect_language(text: str) -> QueryLanguage:
 
 def parse_intent(query: str, language: QueryLanguage) -> tuple[QueryIntent, float]:
     """Parse the intent from a natural language query."""
-    query_lower = query.lower()
-    patterns = ARABIC_PATTERNS if language == QueryLanguage.ARABIC else ENGLISH_PATTERNS
+    return _match_intent(query.lower(), language)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _match_intent(query_lower: str, language: QueryLanguage) -> tuple[QueryIntent, float]:
+    """Match a lowercased query against the intent patterns; cached for repeated queries."""
+    if language == QueryLanguage.ARABIC:
+        patterns, database = _ARABIC_INTENTS, _ARABIC_INTENT_DB
+    else:
+        patterns, database = _ENGLISH_INTENTS, _ENGLISH_INTENT_DB
 
-    for pattern, intent in patterns.items():
-        if re.search(pattern, query_lower, re.IGNORECASE):
+    if database is not None:
+        matched: List[int] = []
+        database.scan(query_lower.encode(), match_event_handler=_on_intent_match, context=matched)
+        if matched:
+            return patterns[min(matched)][1], 0.85
+        return QueryIntent.UNKNOWN, 0.3
+
+    for pattern, intent in patterns:
+        if pattern.search(query_lower):
             return intent, 0.85
 
     return QueryIntent.UNKNOWN, 0.3
@@ -207,10 +328,16 @@ def parse_intent(query: str, language: QueryLanguage) -> tuple[QueryIntent, floa
 
 def extract_entities(query: str) -> Dict[str, Any]:
     """Extract entities from query."""
+    return dict(_extract_entities(query))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _extract_entities(query: str) -> tuple:
+    """Extract entities as (name, value) pairs; cached for repeated queries."""
     entities = {}
 
-    for entity_name, pattern in ENTITY_PATTERNS.items():
-        matches = re.findall(pattern, query, re.IGNORECASE)
+    for entity_name, pattern in _ENTITY_PATTERNS:
+        matches = pattern.findall(query)
         if matches:
             if entity_name in ["field_id", "number"]:
                 entities[entity_name] = matches[0] if isinstance(matches[0], str) else matches[0][-1]
@@ -223,131 +350,141 @@ def extract_entities(query: str) -> Dict[str, Any]:
             else:
                 entities[entity_name] = matches[0]
 
-    return entities
+    return tuple(entities.items())
+
+
+for _cache_name, _cached_fn in (("intent", _match_intent), ("entities", _extract_entities)):
+    PARSE_CACHE.labels(cache=_cache_name, result="hit").set_function(
+        lambda fn=_cached_fn: fn.cache_info().hits
+    )
+    PARSE_CACHE.labels(cache=_cache_name, result="miss").set_function(
+        lambda fn=_cached_fn: fn.cache_info().misses
+    )
+
+
+# SQL shown alongside parsed queries, dedented and stripped once at import
+_SQL_TEMPLATES_RAW = {
+    QueryIntent.NDVI_STATUS: """
+        SELECT f.name_ar, n.ndvi_value, n.acquisition_date
+        FROM sahool.fields f
+        JOIN sahool.ndvi_results n ON f.id = n.field_id
+        WHERE f.id = :field_id
+        ORDER BY n.acquisition_date DESC
+        LIMIT 10
+    """,
+    QueryIntent.WEATHER_INFO: """
+        SELECT w.temperature, w.humidity, w.rainfall_mm, w.forecast_date
+        FROM sahool.weather_data w
+        WHERE w.region_id = :region_id
+        ORDER BY w.forecast_date DESC
+        LIMIT 7
+    """,
+    QueryIntent.FIELD_INFO: """
+        SELECT f.*, r.name_ar as region_name
+        FROM sahool.fields f
+        JOIN sahool.regions r ON f.region_id = r.id
+        WHERE f.id = :field_id
+    """,
+    QueryIntent.REGION_STATS: """
+        SELECT r.name_ar, COUNT(f.id) as field_count, SUM(f.area_hectares) as total_area
+        FROM sahool.regions r
+        LEFT JOIN sahool.fields f ON r.id = f.region_id
+        WHERE r.name_ar = :region_name
+        GROUP BY r.id
+    """,
+    QueryIntent.ALERTS: """
+        SELECT a.alert_type, a.severity, a.title_ar, a.created_at
+        FROM sahool.alerts a
+        WHERE a.status = 'active'
+        ORDER BY a.severity DESC, a.created_at DESC
+        LIMIT 20
+    """,
+}
+
+_SQL_TEMPLATES = {
+    intent: sys.intern(textwrap.dedent(sql).strip())
+    for intent, sql in _SQL_TEMPLATES_RAW.items()
+}
+_SQL_FALLBACK = "-- Complex query, requires custom handling"
 
 
 def generate_sql_equivalent(intent: QueryIntent, entities: Dict[str, Any]) -> str:
     """Generate SQL equivalent for the query (for reference/debugging)."""
-    sql_templates = {
-        QueryIntent.NDVI_STATUS: """
-            SELECT f.name_ar, n.ndvi_value, n.acquisition_date
-            FROM sahool.fields f
-            JOIN sahool.ndvi_results n ON f.id = n.field_id
-            WHERE f.id = :field_id
-            ORDER BY n.acquisition_date DESC
-            LIMIT 10
-        """,
-        QueryIntent.WEATHER_INFO: """
-            SELECT w.temperature, w.humidity, w.rainfall_mm, w.forecast_date
-            FROM sahool.weather_data w
-            WHERE w.region_id = :region_id
-            ORDER BY w.forecast_date DESC
-            LIMIT 7
-        """,
-        QueryIntent.FIELD_INFO: """
-            SELECT f.*, r.name_ar as region_name
-            FROM sahool.fields f
-            JOIN sahool.regions r ON f.region_id = r.id
-            WHERE f.id = :field_id
-        """,
-        QueryIntent.REGION_STATS: """
-            SELECT r.name_ar, COUNT(f.id) as field_count, SUM(f.area_hectares) as total_area
-            FROM sahool.regions r
-            LEFT JOIN sahool.fields f ON r.id = f.region_id
-            WHERE r.name_ar = :region_name
-            GROUP BY r.id
-        """,
-        QueryIntent.ALERTS: """
-            SELECT a.alert_type, a.severity, a.title_ar, a.created_at
-            FROM sahool.alerts a
-            WHERE a.status = 'active'
-            ORDER BY a.severity DESC, a.created_at DESC
-            LIMIT 20
-        """,
-    }
-
-    return sql_templates.get(intent, "-- Complex query, requires custom handling")
+    return _SQL_TEMPLATES.get(intent, _SQL_FALLBACK)
 
 # =============================================================================
 # Mock Data Generator (In production, queries DB)
 # =============================================================================
 
+# Mock results per intent, built once; the dicts are shared between requests
+# and must not be mutated
+_RESULTS_BY_INTENT: Dict[QueryIntent, tuple] = {
+    QueryIntent.NDVI_STATUS: (
+        {"field_id": "f-001", "field_name": "حقل القمح", "ndvi": 0.65, "health": "جيد"},
+        {"field_id": "f-002", "field_name": "حقل البن", "ndvi": 0.72, "health": "ممتاز"},
+        {"field_id": "f-003", "field_name": "حقل الذرة", "ndvi": 0.38, "health": "يحتاج اهتمام"},
+    ),
+    QueryIntent.WEATHER_INFO: (
+        {"date": "2024-12-03", "temp_min": 18, "temp_max": 28, "humidity": 45, "condition": "مشمس"},
+        {"date": "2024-12-04", "temp_min": 17, "temp_max": 27, "humidity": 50, "condition": "غائم جزئياً"},
+        {"date": "2024-12-05", "temp_min": 16, "temp_max": 25, "humidity": 60, "condition": "ممطر"},
+    ),
+    QueryIntent.ALERTS: (
+        {"type": "weather", "severity": "high", "title_ar": "موجة حر متوقعة"},
+        {"type": "ndvi", "severity": "medium", "title_ar": "انخفاض صحة المحصول"},
+    ),
+    QueryIntent.RECOMMENDATIONS: (
+        {"type": "irrigation", "priority": "high", "title_ar": "زيادة الري"},
+        {"type": "fertilization", "priority": "medium", "title_ar": "إضافة سماد نيتروجيني"},
+    ),
+    QueryIntent.COMPARISON: (
+        {"field_a": "حقل 1", "field_b": "حقل 2", "ndvi_a": 0.65, "ndvi_b": 0.72},
+    ),
+    QueryIntent.TREND: (
+        {"month": "October", "avg_ndvi": 0.55},
+        {"month": "November", "avg_ndvi": 0.60},
+        {"month": "December", "avg_ndvi": 0.65},
+    ),
+}
+
+# Templates completed with extracted entities
+_FIELD_INFO_RESULT = {
+    "name_ar": "حقل القمح الشمالي",
+    "area_hectares": 15.5,
+    "crop_type": "wheat",
+    "crop_name_ar": "القمح",
+    "region": "صنعاء",
+    "status": "active",
+    "planting_date": "2024-10-15"
+}
+_REGION_STATS_RESULT = {
+    "total_fields": 245,
+    "total_area_hectares": 3250.5,
+    "active_farmers": 180,
+    "avg_ndvi": 0.58,
+    "top_crops": ["قمح", "بن", "قات"]
+}
+_NO_RESULTS = ({"message": "No results found", "message_ar": "لا توجد نتائج"},)
+
 
 def execute_query(
     intent: QueryIntent, entities: Dict[str, Any], limit: int
-) -> List[Dict[str, Any]]:
+) -> Sequence[Dict[str, Any]]:
     """Execute query and return results. In production, this queries the database."""
 
-    if intent == QueryIntent.NDVI_STATUS:
-        return [
-            {"field_id": "f-001", "field_name": "حقل القمح", "ndvi": 0.65, "health": "جيد"},
-            {"field_id": "f-002", "field_name": "حقل البن", "ndvi": 0.72, "health": "ممتاز"},
-            {"field_id": "f-003", "field_name": "حقل الذرة", "ndvi": 0.38, "health": "يحتاج اهتمام"},
-        ][:limit]
+    if intent == QueryIntent.FIELD_INFO:
+        return [{"field_id": entities.get("field_id", "f-001"), **_FIELD_INFO_RESULT}]
 
-    elif intent == QueryIntent.WEATHER_INFO:
-        return [
-            {"date": "2024-12-03", "temp_min": 18, "temp_max": 28, "humidity": 45, "condition": "مشمس"},
-            {"date": "2024-12-04", "temp_min": 17, "temp_max": 27, "humidity": 50, "condition": "غائم جزئياً"},
-            {"date": "2024-12-05", "temp_min": 16, "temp_max": 25, "humidity": 60, "condition": "ممطر"},
-        ][:limit]
-
-    elif intent == QueryIntent.FIELD_INFO:
-        return [
-            {
-                "field_id": entities.get("field_id", "f-001"),
-                "name_ar": "حقل القمح الشمالي",
-                "area_hectares": 15.5,
-                "crop_type": "wheat",
-                "crop_name_ar": "القمح",
-                "region": "صنعاء",
-                "status": "active",
-                "planting_date": "2024-10-15"
-            }
-        ]
-
-    elif intent == QueryIntent.REGION_STATS:
+    if intent == QueryIntent.REGION_STATS:
         region = entities.get("region_ar") or entities.get("region_en", "صنعاء")
-        return [
-            {
-                "region": region,
-                "total_fields": 245,
-                "total_area_hectares": 3250.5,
-                "active_farmers": 180,
-                "avg_ndvi": 0.58,
-                "top_crops": ["قمح", "بن", "قات"]
-            }
-        ]
-
-    elif intent == QueryIntent.ALERTS:
-        return [
-            {"type": "weather", "severity": "high", "title_ar": "موجة حر متوقعة"},
-            {"type": "ndvi", "severity": "medium", "title_ar": "انخفاض صحة المحصول"},
-        ][:limit]
-
-    elif intent == QueryIntent.RECOMMENDATIONS:
-        return [
-            {"type": "irrigation", "priority": "high", "title_ar": "زيادة الري"},
-            {"type": "fertilization", "priority": "medium", "title_ar": "إضافة سماد نيتروجيني"},
-        ][:limit]
-
-    elif intent == QueryIntent.COMPARISON:
-        return [
-            {"field_a": "حقل 1", "field_b": "حقل 2", "ndvi_a": 0.65, "ndvi_b": 0.72}
-        ]
+        return [{"region": region, **_REGION_STATS_RESULT}]
 
-    elif intent == QueryIntent.TREND:
-        return [
-            {"month": "October", "avg_ndvi": 0.55},
-            {"month": "November", "avg_ndvi": 0.60},
-            {"month": "December", "avg_ndvi": 0.65},
-        ][:limit]
-
-    return [{"message": "No results found", "message_ar": "لا توجد نتائج"}]
+    # Slicing a tuple past its end returns the same tuple, so no copy is made
+    return _RESULTS_BY_INTENT.get(intent, _NO_RESULTS)[:limit]
 
 
 def generate_summary(
-    intent: QueryIntent, results: List[Dict], language: QueryLanguage
+    intent: QueryIntent, results: Sequence[Dict], language: QueryLanguage
 ) -> tuple[str, str]:
     """Generate human-readable summary of results."""
 
@@ -355,7 +492,7 @@ def generate_summary(
         return "لا توجد نتائج للاستعلام", "No results found for the query"
 
     if intent == QueryIntent.NDVI_STATUS:
-        avg_ndvi = sum(r.get("ndvi", 0) for r in results) / len(results)
+        avg_ndvi = fmean(r.get("ndvi", 0) for r in results)
         ar = f"تم العثور على {len(results)} حقل. متوسط NDVI: {avg_ndvi:.2f}"
         en = f"Found {len(results)} fields. Average NDVI: {avg_ndvi:.2f}"
 
@@ -382,6 +519,58 @@ def generate_summary(
 
     return ar, en
 
+
+def run_query(query_request: NaturalQuery, executed_at: datetime, query_id: str) -> QueryResult:
+    """Parse and execute a single natural language query."""
+    start_ns = time.perf_counter_ns()
+    query_text = query_request.query.strip()
+
+    # Detect language
+    language = query_request.language
+    if language == QueryLanguage.AUTO:
+        language = detect_language(query_text)
+
+    # Parse intent
+    intent, confidence = parse_intent(query_text, language)
+
+    # Extract entities
+    entities = extract_entities(query_text)
+
+    # Generate SQL equivalent
+    sql = generate_sql_equivalent(intent, entities)
+
+    # Create parsed query object
+    parsed = ParsedQuery(
+        original_query=query_text,
+        language=language,
+        intent=intent,
+        entities=entities,
+        confidence=confidence,
+        sql_equivalent=sql
+    )
+
+    # Execute query
+    results = execute_query(intent, entities, query_request.limit)
+
+    # Generate summary
+    summary_ar, summary_en = generate_summary(intent, results, language)
+
+    execution_time = (time.perf_counter_ns() - start_ns) / 1e6
+
+    _REQ_SUCCESS_BY_INTENT[intent].inc()
+    _QUERY_PARSED_BY_LANG_INTENT[language, intent].inc()
+
+    return QueryResult(
+        query_id=query_id,
+        parsed=parsed,
+        results=results,
+        summary_ar=summary_ar,
+        summary_en=summary_en,
+        executed_at=executed_at,
+        execution_time_ms=execution_time
+    )
+
+
 # =============================================================================
 # API Endpoints
 # =============================================================================
@@ -411,61 +600,103 @@ async def execute_natural_query(query_request: NaturalQuery):
     - "كم عدد الحقول في تعز؟"
     - "Show me NDVI trends for the last month"
     """
-    import time
-    start_time = time.time()
-
-    with REQUEST_LATENCY.labels(endpoint="query").time():
+    with _LAT_QUERY.time():
         try:
-            query_text = query_request.query.strip()
-
-            # Detect language
-            language = query_request.language
-            if language == QueryLanguage.AUTO:
-                language = detect_language(query_text)
-
-            # Parse intent
-            intent, confidence = parse_intent(query_text, language)
-
-            # Extract entities
-            entities = extract_entities(query_text)
-
-            # Generate SQL equivalent
-            sql = generate_sql_equivalent(intent, entities)
-
-            # Create parsed query object
-            parsed = ParsedQuery(
-                original_query=query_text,
-                language=language,
-                intent=intent,
-                entities=entities,
-                confidence=confidence,
-                sql_equivalent=sql.strip()
-            )
-
-            # Execute query
-            results = execute_query(intent, entities, query_request.limit)
-
-            # Generate summary
-            summary_ar, summary_en = generate_summary(intent, results, language)
-
-            execution_time = (time.time() - start_time) * 1000
-
-            REQUEST_COUNT.labels(query_type=intent.value, status="success").inc()
-            QUERY_PARSED.labels(language=language.value, intent=intent.value).inc()
+            executed_at = datetime.now(timezone.utc)
+            return run_query(query_request, executed_at, f"q-{int(executed_at.timestamp() * 1000)}")
+        except Exception as e:
+            _REQ_ERROR.inc()
+            raise HTTPException(status_code=500, detail=str(e))
 
-            return QueryResult(
-                query_id=f"q-{int(start_time * 1000)}",
-                parsed=parsed,
-                results=results,
-                summary_ar=summary_ar,
-                summary_en=summary_en,
-                executed_at=datetime.utcnow(),
-                execution_time_ms=execution_time
-            )
 
+@app.post("/api/v1/query/batch", response_model=List[QueryResult])
+async def execute_natural_query_batch(batch: BatchQuery):
+    """
+    Execute several natural language queries in one request.
+    تنفيذ عدة استعلامات باللغة الطبيعية في طلب واحد.
+    """
+    with _LAT_BATCH.time():
+        try:
+            executed_at = datetime.now(timezone.utc)
+            batch_id = f"q-{int(executed_at.timestamp() * 1000)}"
+            return [
+                run_query(query_request, executed_at, f"{batch_id}-{index}")
+                for index, query_request in enumerate(batch.queries)
+            ]
         except Exception as e:
-            REQUEST_COUNT.labels(query_type="error", status="error").inc()
-            raise HTTPException(status_code=500, detail=str(e))
+            _REQ_ERROR.inc()
+            logger.exception("Batch query failed (%d queries)", len(batch.queries))
+            raise HTTPException(status_code=500, detail="Batch query failed") from e
+
+
+# Example queries per language and category
+QUERY_SUGGESTIONS = {
+    "ar": {
+        "ndvi": [
+            "ما حالة صحة الحقول؟",
+            "أرني قيم NDVI لحقولي",
+            "أي الحقول تحتاج اهتمام؟"
+        ],
+        "weather": [
+            "ما توقعات الطقس لهذا الأسبوع؟",
+            "هل سيمطر غداً؟",
+            "ما درجة الحرارة المتوقعة؟"
+        ],
+        "fields": [
+            "كم عدد حقولي؟",
+            "ما مساحة حقولي الإجمالية؟",
+            "معلومات عن الحقل الشمالي"
+        ],
+        "regions": [
+            "إحصائيات منطقة صنعاء",
+            "كم حقل في تعز؟",
+            "أي منطقة لديها أعلى إنتاج؟"
+        ],
+        "alerts": [
+            "هل يوجد تنبيهات؟",
+            "أرني التحذيرات الحالية",
+            "ما المشاكل في حقولي؟"
+        ]
+    },
+    "en": {
+        "ndvi": [
+            "What is the health status of my fields?",
+            "Show me NDVI values",
+            "Which fields need attention?"
+        ],
+        "weather": [
+            "What is the weather forecast?",
+            "Will it rain tomorrow?",
+            "What is the expected temperature?"
+        ],
+        "fields": [
+            "How many fields do I have?",
+            "What is my total field area?",
+            "Information about field 1"
+        ],
+        "regions": [
+            "Statistics for Sana'a region",
+            "How many fields in Taiz?",
+            "Which region has highest production?"
+        ],
+        "alerts": [
+            "Are there any alerts?",
+            "Show current warnings",
+            "What problems are in my fields?"
+        ]
+    }
+}
+
+# Suggestion responses encoded once; keyed by (language, category or None for all)
+_SUGGESTION_PAYLOADS = {
+    (lang_key, None): orjson.dumps({"categories": categories})
+    for lang_key, categories in QUERY_SUGGESTIONS.items()
+}
+_SUGGESTION_PAYLOADS.update(
+    ((lang_key, category), orjson.dumps({"category": category, "suggestions": suggestions}))
+    for lang_key, categories in QUERY_SUGGESTIONS.items()
+    for category, suggestions in categories.items()
+)
 
 
 @app.get("/api/v1/query/suggestions")
@@ -477,69 +708,9 @@ async def get_query_suggestions(
     Get example queries/suggestions.
     الحصول على أمثلة للاستعلامات.
     """
-    suggestions = {
-        "ar": {
-            "ndvi": [
-                "ما حالة صحة الحقول؟",
-                "أرني قيم NDVI لحقولي",
-                "أي الحقول تحتاج اهتمام؟"
-            ],
-            "weather": [
-                "ما توقعات الطقس لهذا الأسبوع؟",
-                "هل سيمطر غداً؟",
-                "ما درجة الحرارة المتوقعة؟"
-            ],
-            "fields": [
-                "كم عدد حقولي؟",
-                "ما مساحة حقولي الإجمالية؟",
-                "معلومات عن الحقل الشمالي"
-            ],
-            "regions": [
-                "إحصائيات منطقة صنعاء",
-                "كم حقل في تعز؟",
-                "أي منطقة لديها أعلى إنتاج؟"
-            ],
-            "alerts": [
-                "هل يوجد تنبيهات؟",
-                "أرني التحذيرات الحالية",
-                "ما المشاكل في حقولي؟"
-            ]
-        },
-        "en": {
-            "ndvi": [
-                "What is the health status of my fields?",
-                "Show me NDVI values",
-                "Which fields need attention?"
-            ],
-            "weather": [
-                "What is the weather forecast?",
-                "Will it rain tomorrow?",
-                "What is the expected temperature?"
-            ],
-            "fields": [
-                "How many fields do I have?",
-                "What is my total field area?",
-                "Information about field 1"
-            ],
-            "regions": [
-                "Statistics for Sana'a region",
-                "How many fields in Taiz?",
-                "Which region has highest production?"
-            ],
-            "alerts": [
-                "Are there any alerts?",
-                "Show current warnings",
-                "What problems are in my fields?"
-            ]
-        }
-    }
-
     lang_key = "ar" if language == QueryLanguage.ARABIC else "en"
-
-    if category and category in suggestions[lang_key]:
-        return {"category": category, "suggestions": suggestions[lang_key][category]}
-
-    return {"categories": suggestions[lang_key]}
+    payload = _SUGGESTION_PAYLOADS.get((lang_key, category)) or _SUGGESTION_PAYLOADS[(lang_key, None)]
+    return Response(content=payload, media_type="application/json")
 
 
 @app.get("/api/v1/query/parse")
@@ -564,7 +735,7 @@ async def parse_query_only(
         intent=intent,
         entities=entities,
         confidence=confidence,
-        sql_equivalent=sql.strip()
+        sql_equivalent=sql
     )
 
 # =============================================================================
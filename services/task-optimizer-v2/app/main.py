@@ -6,26 +6,15 @@ Optimizes agricultural task scheduling and resource allocation.
 """
 
 import os
-import sys
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict, Any
 
-sys.path.insert(0, "/app/libs-shared")
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
-from fastapi import FastAPI, HTTPException, Query  # noqa: E402
-from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from pydantic import BaseModel, Field  # noqa: E402
-
-try:
-    from sahool_shared.utils import setup_logging, get_logger  # noqa: E402
-except ImportError:
-    import logging
-
-    def setup_logging(service_name: str):
-        pass
-
-    def get_logger(name: str):
-        return logging.getLogger(name)
+from sahool_shared.utils import setup_logging, get_logger
 
 logger = get_logger(__name__)
 
@@ -99,6 +88,7 @@ app = FastAPI(
     description="محسن المهام الزراعية - Agricultural Task Optimizer",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
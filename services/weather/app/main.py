@@ -5,36 +5,77 @@ Sahool Yemen v9.0.0
 This service provides weather data for fields and regions.
 """
 
-import sys
-sys.path.insert(0, "/app/libs-shared")
-
-from contextlib import asynccontextmanager  # noqa: E402
-from datetime import date, timedelta  # noqa: E402
-from typing import Optional  # noqa: E402
-from uuid import UUID  # noqa: E402
-
-from fastapi import FastAPI, Depends, HTTPException  # noqa: E402
-from fastapi.responses import Response  # noqa: E402
-from prometheus_client import Counter, Histogram, generate_latest  # noqa: E402
-from sqlalchemy import select, and_  # noqa: E402
-from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
-
-from sahool_shared.models import WeatherData, Field, Region  # noqa: E402
-from sahool_shared.schemas.weather import (  # noqa: E402
+import gzip
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import generate_latest
+from sqlalchemy import Row, select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sahool_shared.models import WeatherData, Field, Region
+from sahool_shared.schemas.weather import (
     WeatherForecast, WeatherData as WeatherDataSchema
 )
-from sahool_shared.schemas.common import HealthResponse, ErrorResponse  # noqa: E402
-from sahool_shared.auth import get_current_user, AuthenticatedUser  # noqa: E402
-from sahool_shared.utils import get_db, setup_logging, get_logger  # noqa: E402
-from sahool_shared.cache import cached  # noqa: E402
-from sahool_shared.events import publish_event, WeatherUpdatedEvent  # noqa: E402
-
-# Metrics
-REQUEST_COUNT = Counter("weather_requests_total", "Total requests", ["method", "endpoint", "status"])
-REQUEST_LATENCY = Histogram("weather_request_latency_seconds", "Request latency", ["method", "endpoint"])
+from sahool_shared.schemas.common import HealthResponse, ErrorResponse
+from sahool_shared.auth import get_current_user, AuthenticatedUser
+from sahool_shared.utils import get_db, setup_logging, get_logger
+from sahool_shared.cache import cache_response, get_cache
+from sahool_shared.events import publish_event, WeatherUpdatedEvent
 
 logger = get_logger(__name__)
 
+# Seconds a forecast stays in the in-process cache in front of Redis
+WEATHER_LOCAL_TTL = 60
+# Seconds a generated forecast is reused for locations without data
+WEATHER_MOCK_TTL = 1800
+
+# Seconds a rendered /metrics body is reused by concurrent or repeated scrapes
+METRICS_CACHE_SECONDS = 5
+# (rendered_at, body, gzipped body) of the last /metrics render
+_metrics_cache = (float("-inf"), b"", b"")
+
+# Yemen weather profiles for generated forecasts
+_WEATHER_PROFILES = {
+    "coastal": {"temp_base": 30, "humidity_base": 70, "rain_chance": 0.1},
+    "highland": {"temp_base": 22, "humidity_base": 45, "rain_chance": 0.2},
+    "desert": {"temp_base": 35, "humidity_base": 25, "rain_chance": 0.05},
+}
+_DEFAULT_PROFILE = "highland"
+_WIND_DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+_RNG = np.random.default_rng()
+
+
+# Weather columns read when building responses
+_WEATHER_COLUMNS = (
+    WeatherData.forecast_date,
+    WeatherData.temperature,
+    WeatherData.humidity,
+    WeatherData.rainfall,
+    WeatherData.wind_speed,
+    WeatherData.wind_direction,
+    WeatherData.pressure,
+    WeatherData.solar_radiation,
+    WeatherData.source,
+)
+
+
+def _field_weather_key(field_id, db, user) -> str:
+    """Cache key for field weather, scoped to the caller's tenant."""
+    return f"{field_id}:{user.tenant_id}"
+
+
+def _region_weather_key(region_id, db, user) -> str:
+    """Cache key for region weather, shared by all tenants."""
+    return str(region_id)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -50,6 +91,7 @@ app = FastAPI(
     description="خدمة الطقس لمنصة سهول اليمن",
     version="9.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -64,9 +106,23 @@ async def health_check():
 
 
 @app.get("/metrics")
-async def metrics():
-    """Prometheus metrics endpoint."""
-    return Response(content=generate_latest(), media_type="text/plain")
+async def metrics(request: Request):
+    """Prometheus metrics endpoint, gzipped for scrapers that accept it."""
+    global _metrics_cache
+    now = time.monotonic()
+    rendered_at, body, compressed = _metrics_cache
+    if now - rendered_at >= METRICS_CACHE_SECONDS:
+        body = generate_latest()
+        compressed = gzip.compress(body, compresslevel=5)
+        _metrics_cache = (now, body, compressed)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=compressed,
+            media_type="text/plain",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=body, media_type="text/plain")
 
 
 @app.get(
@@ -74,7 +130,7 @@ async def metrics():
     response_model=WeatherForecast,
     responses={404: {"model": ErrorResponse}},
 )
-@cached(ttl=1800, prefix="weather:field")
+@cache_response(ttl=1800, key_fn=_field_weather_key, local_ttl=WEATHER_LOCAL_TTL)
 async def get_field_weather(
     field_id: UUID,
     db: AsyncSession = Depends(get_db),
@@ -84,58 +140,33 @@ async def get_field_weather(
     Get weather data for a specific field.
     الحصول على بيانات الطقس لحقل معين
     """
-    # Get field with tenant check
+    # Get field with tenant check and its latest weather data in one query;
+    # no rows means no field, a single NULL row means no weather data yet
     result = await db.execute(
-        select(Field).where(
-            and_(Field.id == field_id, Field.tenant_id == UUID(user.tenant_id))
-        )
+        select(Field.id, WeatherData.id.label("weather_id"), *_WEATHER_COLUMNS)
+        .outerjoin(WeatherData, WeatherData.field_id == Field.id)
+        .where(and_(Field.id == field_id, Field.tenant_id == user.tenant_uuid))
+        .order_by(WeatherData.forecast_date.desc())
+        .limit(6)
     )
-    field = result.scalar_one_or_none()
+    rows = result.all()
 
-    if not field:
+    if not rows:
         raise HTTPException(status_code=404, detail="الحقل غير موجود")
 
-    # Get latest weather data
-    weather_result = await db.execute(
-        select(WeatherData)
-        .where(WeatherData.field_id == field_id)
-        .order_by(WeatherData.forecast_date.desc())
-        .limit(6)
-    )
-    weather_records = weather_result.scalars().all()
+    weather_records = [row for row in rows if row.weather_id is not None]
 
     if not weather_records:
         # Return mock data if no records
         return await _generate_weather_forecast(field_id, str(user.tenant_id))
 
     current = weather_records[0]
-    forecast = weather_records[1:] if len(weather_records) > 1 else []
 
-    return WeatherForecast(
+    return WeatherForecast.model_construct(
         location_id=str(field_id),
         location_type="field",
-        current=WeatherDataSchema(
-            date=current.forecast_date or date.today(),
-            temperature=float(current.temperature or 25),
-            humidity=float(current.humidity or 50),
-            rainfall=float(current.rainfall or 0),
-            wind_speed=float(current.wind_speed or 3),
-            wind_direction=current.wind_direction or "N",
-            pressure=float(current.pressure or 1013) if current.pressure else None,
-            solar_radiation=float(current.solar_radiation) if current.solar_radiation else None,
-        ),
-        forecast=[
-            WeatherDataSchema(
-                date=w.forecast_date or date.today(),
-                temperature=float(w.temperature or 25),
-                humidity=float(w.humidity or 50),
-                rainfall=float(w.rainfall or 0),
-                wind_speed=float(w.wind_speed or 3),
-                wind_direction=w.wind_direction or "N",
-                pressure=float(w.pressure or 1013) if w.pressure else None,
-            )
-            for w in forecast
-        ],
+        current=_record_to_schema(current, include_pressure=True, include_solar=True),
+        forecast=[_record_to_schema(w, include_pressure=True) for w in weather_records[1:]],
         source=current.source or "OpenWeather",
     )
 
@@ -144,7 +175,7 @@ async def get_field_weather(
     "/api/v1/weather/regions/{region_id}",
     response_model=WeatherForecast,
 )
-@cached(ttl=1800, prefix="weather:region")
+@cache_response(ttl=1800, key_fn=_region_weather_key, local_ttl=WEATHER_LOCAL_TTL)
 async def get_region_weather(
     region_id: int,
     db: AsyncSession = Depends(get_db),
@@ -154,109 +185,160 @@ async def get_region_weather(
     Get weather data for a region.
     الحصول على بيانات الطقس لمنطقة
     """
-    # Get region
-    result = await db.execute(select(Region).where(Region.id == region_id))
-    region = result.scalar_one_or_none()
-
-    if not region:
-        raise HTTPException(status_code=404, detail="المنطقة غير موجودة")
-
-    # Get latest weather data for region
-    weather_result = await db.execute(
-        select(WeatherData)
-        .where(WeatherData.region_id == region_id)
+    # Get region and its latest weather data in one query
+    result = await db.execute(
+        select(Region.id, WeatherData.id.label("weather_id"), *_WEATHER_COLUMNS)
+        .outerjoin(WeatherData, WeatherData.region_id == Region.id)
+        .where(Region.id == region_id)
         .order_by(WeatherData.forecast_date.desc())
         .limit(6)
     )
-    weather_records = weather_result.scalars().all()
+    rows = result.all()
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="المنطقة غير موجودة")
+
+    weather_records = [row for row in rows if row.weather_id is not None]
 
     if not weather_records:
         return await _generate_weather_forecast(None, str(user.tenant_id), region_id)
 
     current = weather_records[0]
-    forecast = weather_records[1:] if len(weather_records) > 1 else []
 
-    return WeatherForecast(
+    return WeatherForecast.model_construct(
         location_id=str(region_id),
         location_type="region",
-        current=WeatherDataSchema(
-            date=current.forecast_date or date.today(),
-            temperature=float(current.temperature or 25),
-            humidity=float(current.humidity or 50),
-            rainfall=float(current.rainfall or 0),
-            wind_speed=float(current.wind_speed or 3),
-            wind_direction=current.wind_direction or "N",
-        ),
-        forecast=[
-            WeatherDataSchema(
-                date=w.forecast_date or date.today(),
-                temperature=float(w.temperature or 25),
-                humidity=float(w.humidity or 50),
-                rainfall=float(w.rainfall or 0),
-                wind_speed=float(w.wind_speed or 3),
-                wind_direction=w.wind_direction or "N",
-            )
-            for w in forecast
-        ],
+        current=_record_to_schema(current),
+        forecast=[_record_to_schema(w) for w in weather_records[1:]],
         source=current.source or "OpenWeather",
     )
 
 
+def _record_to_schema(
+    w: Row,
+    include_pressure: bool = False,
+    include_solar: bool = False,
+) -> WeatherDataSchema:
+    """Convert a stored weather record, filling defaults for missing readings."""
+    # Values come straight from typed DB columns, so validation is skipped
+    return WeatherDataSchema.model_construct(
+        date=w.forecast_date or date.today(),
+        temperature=float(w.temperature or 25),
+        humidity=float(w.humidity or 50),
+        rainfall=float(w.rainfall or 0),
+        wind_speed=float(w.wind_speed or 3),
+        wind_direction=w.wind_direction or "N",
+        pressure=float(w.pressure) if include_pressure and w.pressure else None,
+        solar_radiation=float(w.solar_radiation) if include_solar and w.solar_radiation else None,
+    )
+
+
 async def _generate_weather_forecast(
     field_id: Optional[UUID],
     tenant_id: str,
     region_id: Optional[int] = None,
 ) -> WeatherForecast:
-    """Generate weather forecast (mock data for demo)."""
-    import random
-
+    """
+    Generate weather forecast (mock data for demo).
+    Generated days are shared per profile and day, so locations without
+    data reuse one forecast and the update event is published once.
+    """
     today = date.today()
-
-    # Yemen weather profiles
-    profiles = {
-        "coastal": {"temp_base": 30, "humidity_base": 70, "rain_chance": 0.1},
-        "highland": {"temp_base": 22, "humidity_base": 45, "rain_chance": 0.2},
-        "desert": {"temp_base": 35, "humidity_base": 25, "rain_chance": 0.05},
-    }
-    profile = profiles.get("highland")  # Default to highland
-
-    def generate_day(d: date) -> WeatherDataSchema:
-        return WeatherDataSchema(
-            date=d,
-            temperature=round(profile["temp_base"] + random.uniform(-5, 8), 1),
-            humidity=round(profile["humidity_base"] + random.uniform(-15, 20), 1),
-            rainfall=round(random.uniform(0, 10) if random.random() < profile["rain_chance"] else 0, 1),
-            wind_speed=round(random.uniform(1, 8), 1),
-            wind_direction=random.choice(["N", "NE", "E", "SE", "S", "SW", "W", "NW"]),
-            pressure=round(1013 + random.uniform(-10, 10), 1),
-            solar_radiation=round(random.uniform(300, 700), 0),
+    key = f"weather:mock:{_DEFAULT_PROFILE}:{today.isoformat()}"
+
+    try:
+        cache = await get_cache()
+        cached_days = await cache.get_json(key)
+    except Exception:
+        cache, cached_days = None, None
+
+    if cached_days is not None:
+        days_data = [WeatherDataSchema(**day) for day in cached_days]
+    else:
+        days_data = _draw_weather_days(today, _WEATHER_PROFILES[_DEFAULT_PROFILE])
+
+        # Publish event
+        current = days_data[0]
+        await publish_event(
+            WeatherUpdatedEvent.create(
+                region_id=region_id,
+                field_id=str(field_id) if field_id else None,
+                tenant_id=tenant_id,
+                temperature=current.temperature,
+                humidity=current.humidity,
+                rainfall=current.rainfall,
+                forecast_date=today,
+            )
         )
 
-    current = generate_day(today)
-    forecast = [generate_day(today + timedelta(days=i)) for i in range(1, 6)]
-
-    # Publish event
-    await publish_event(
-        WeatherUpdatedEvent.create(
-            region_id=region_id,
-            field_id=str(field_id) if field_id else None,
-            tenant_id=tenant_id,
-            temperature=current.temperature,
-            humidity=current.humidity,
-            rainfall=current.rainfall,
-            forecast_date=today,
-        )
-    )
+        if cache is not None:
+            try:
+                await cache.set(
+                    key, [day.model_dump(mode="json") for day in days_data], WEATHER_MOCK_TTL
+                )
+            except Exception:
+                pass
 
     return WeatherForecast(
         location_id=str(field_id) if field_id else str(region_id),
         location_type="field" if field_id else "region",
-        current=current,
-        forecast=forecast,
+        current=days_data[0],
+        forecast=days_data[1:],
         source="Demo",
     )
 
 
+def _draw_weather_days(today: date, profile: dict) -> list[WeatherDataSchema]:
+    """Draw today's weather and a 5-day forecast from a weather profile."""
+    days = 6
+
+    # Draw every day's values in one batch per variable
+    temperature = np.round(profile["temp_base"] + _RNG.uniform(-5, 8, days), 1)
+    humidity = np.round(profile["humidity_base"] + _RNG.uniform(-15, 20, days), 1)
+    rainfall = np.where(
+        _RNG.random(days) < profile["rain_chance"],
+        np.round(_RNG.uniform(0, 10, days), 1),
+        0.0,
+    )
+    wind_speed = np.round(_RNG.uniform(1, 8, days), 1)
+    wind_direction = _RNG.integers(0, len(_WIND_DIRECTIONS), days)
+    pressure = np.round(1013 + _RNG.uniform(-10, 10, days), 1)
+    solar_radiation = np.round(_RNG.uniform(300, 700, days), 0)
+
+    return [
+        WeatherDataSchema(
+            date=today + timedelta(days=i),
+            temperature=t,
+            humidity=h,
+            rainfall=r,
+            wind_speed=ws,
+            wind_direction=_WIND_DIRECTIONS[wd],
+            pressure=p,
+            solar_radiation=sr,
+        )
+        for i, (t, h, r, ws, wd, p, sr) in enumerate(zip(
+            temperature.tolist(),
+            humidity.tolist(),
+            rainfall.tolist(),
+            wind_speed.tolist(),
+            wind_direction.tolist(),
+            pressure.tolist(),
+            solar_radiation.tolist(),
+            strict=True,
+        ))
+    ]
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "2")),
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
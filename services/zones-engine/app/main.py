@@ -1,24 +1,21 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
+import json
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 
 app = FastAPI(
     title="Zones Engine",
     version="5.5.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
 # CORS Configuration - use specific origins in production
 CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 CORS_ALLOW_CREDENTIALS = bool(CORS_ORIGINS)  # Only allow credentials with specific origins
@@ -32,24 +29,53 @@ app.add_middleware(
 )
 
 
+# (unix second, encoded body) last served by /health
+_health_response = (0, b"")
+
+
+def _health_body() -> bytes:
+    """Encoded /health body, rebuilt at most once per second for its timestamp."""
+    global _health_response
+    second = int(time.time())
+    if second != _health_response[0]:
+        _health_response = (second, json.dumps({
+            "status": "healthy",
+            "service": "zones-engine",
+            "version": "5.5.0",
+            "timestamp": datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+        }).encode())
+    return _health_response[1]
+
+
+# Bodies of endpoints with fixed responses, encoded once
+_ZONES_BODY = json.dumps({
+    "success": True,
+    "data": [],
+    "message": "Management zones retrieved successfully"
+}).encode()
+
+_ROOT_BODY = json.dumps({
+    "service": "zones-engine",
+    "version": "5.5.0",
+    "description": "Management Zones Engine",
+    "endpoints": [
+        "GET /health",
+        "GET /field/{field_id}",
+        "POST /calculate/{field_id}",
+        "GET /docs"
+    ]
+}).encode()
+
+
 @app.get("/health")
 async def health_check():
-    return {
-        "status": "healthy",
-        "service": "zones-engine",
-        "version": "5.5.0",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return Response(content=_health_body(), media_type="application/json")
 
 
 @app.get("/field/{field_id}")
 async def get_management_zones(field_id: str):
     """Get management zones for a field"""
-    return {
-        "success": True,
-        "data": [],
-        "message": "Management zones retrieved successfully"
-    }
+    return Response(content=_ZONES_BODY, media_type="application/json")
 
 
 @app.post("/calculate/{field_id}")
@@ -68,14 +94,4 @@ async def calculate_zones(field_id: str):
 
 @app.get("/")
 async def root():
-    return {
-        "service": "zones-engine",
-        "version": "5.5.0",
-        "description": "Management Zones Engine",
-        "endpoints": [
-            "GET /health",
-            "GET /field/{field_id}",
-            "POST /calculate/{field_id}",
-            "GET /docs"
-        ]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")